@@ -1 +1,108 @@
-from hanzipy.util import __version__, __version_info__, get_version  # noqa
\ No newline at end of file
+# coding:utf-8
+"""
+hanzipy, Hanzi decomposition and dictionary.
+
+Importing hanzipy is cheap: submodules are imported on first access
+to the names below, and data files are loaded on first use.
+
+    import hanzipy
+
+    hanzipy.decompose("是")  # loads the shared HanziDecomposer
+    hanzipy.dictionary_search("是")  # loads the shared HanziDictionary
+
+hanzipy leaves logging configuration to the application,
+its loggers are the hanzipy.* ones.
+"""
+import logging
+
+from hanzipy.util import __version__, __version_info__, get_version  # noqa
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# name -> module it is imported from, on first access
+LAZY_NAMES = {
+    "HanziDictionary": "hanzipy.dictionary",
+    "HanziDecomposer": "hanzipy.decomposer",
+    "ParallelDecomposer": "hanzipy.parallel",
+    "AsyncHanzi": "hanzipy.aio",
+    "FrozenDataset": "hanzipy.dataset",
+    "Instrumentation": "hanzipy.instrumentation",
+    "LRUCache": "hanzipy.cache",
+    "SQLiteCache": "hanzipy.cache",
+    "TieredCache": "hanzipy.cache",
+    "NotAHanziCharacter": "hanzipy.exceptions",
+    "get_dictionary": "hanzipy.registry",
+    "get_decomposer": "hanzipy.registry",
+}
+
+__all__ = [
+    "__version__",
+    "get_version",
+    "decompose",
+    "decompose_many",
+    "definition_lookup",
+    "dictionary_search",
+    "get_examples",
+    "get_pinyin",
+    "segment",
+] + list(LAZY_NAMES)
+
+
+def __getattr__(name):
+    module_name = LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError("module 'hanzipy' has no attribute '{}'".format(name))
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    # the next accesses don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_NAMES))
+
+
+# Shortcuts to the process-wide shared instances of hanzipy.registry
+def decompose(character, decomposition_type=None):
+    from hanzipy.registry import get_decomposer
+
+    return get_decomposer().decompose(character, decomposition_type)
+
+
+def decompose_many(characterstring, decomposition_type=None):
+    from hanzipy.registry import get_decomposer
+
+    return get_decomposer().decompose_many(characterstring, decomposition_type)
+
+
+def definition_lookup(word, script_type=None):
+    from hanzipy.registry import get_dictionary
+
+    return get_dictionary().definition_lookup(word, script_type)
+
+
+def dictionary_search(character, character_type=None, search_type=None):
+    from hanzipy.registry import get_dictionary
+
+    return get_dictionary().dictionary_search(character, character_type, search_type)
+
+
+def get_examples(character):
+    from hanzipy.registry import get_dictionary
+
+    return get_dictionary().get_examples(character)
+
+
+def get_pinyin(character):
+    from hanzipy.registry import get_dictionary
+
+    return get_dictionary().get_pinyin(character)
+
+
+def segment(phrase):
+    from hanzipy.registry import get_dictionary
+
+    return get_dictionary().segment(phrase)
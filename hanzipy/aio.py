@@ -0,0 +1,184 @@
+# coding:utf-8
+"""
+asyncio facade over the process-wide HanziDictionary and HanziDecomposer.
+
+Loading and lookups run in a bounded thread pool, so the event loop
+is never blocked by them.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from hanzipy import registry
+
+MAX_WORKERS = 4
+BATCH_SIZE = 256
+
+
+class AsyncHanzi:
+    """
+    Awaitable dictionary and decomposer lookups.
+
+    Identical calls in flight at the same time are coalesced: only one of them
+    runs, and every caller gets its result, the very same object.
+    Results must therefore be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        dictionary_options=None,
+        decomposer_options=None,
+        max_workers=MAX_WORKERS,
+        executor=None,
+    ):
+        """
+        dictionary_options, decomposer_options: HanziDictionary and
+        HanziDecomposer options, instances are shared through hanzipy.registry.
+
+        executor: concurrent.futures executor running the lookups,
+        by default a pool of max_workers threads owned by the facade.
+        """
+        self.dictionary_options = dictionary_options or {}
+        self.decomposer_options = decomposer_options or {}
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers, thread_name_prefix="hanzipy"
+        )
+        self.dictionary = None
+        self.decomposer = None
+        # call key -> future of the running computation
+        self.in_flight = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.owns_executor:
+            self.executor.shutdown(wait=False)
+
+    async def run(self, function, *args, **kwargs):
+        """
+        Runs function(*args, **kwargs) in the executor,
+        sharing the computation with the identical calls in flight.
+        """
+        try:
+            key = (function, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            # unhashable arguments, can't be coalesced
+            key = None
+
+        future = self.in_flight.get(key) if key is not None else None
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self.executor, partial(function, *args, **kwargs)
+            )
+
+            if key is not None:
+                self.in_flight[key] = future
+                future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+
+        # a cancelled caller must not cancel the other ones
+        return await asyncio.shield(future)
+
+    async def async_load(self, dictionary=True, decomposer=True):
+        """Loads the dictionary and the decomposer in the background."""
+        loads = []
+
+        if dictionary and self.dictionary is None:
+            loads.append(self.run(self.load_dictionary))
+        if decomposer and self.decomposer is None:
+            loads.append(self.run(self.load_decomposer))
+
+        await asyncio.gather(*loads)
+        return self
+
+    def load_dictionary(self):
+        self.dictionary = registry.get_dictionary(**self.dictionary_options)
+        return self.dictionary
+
+    def load_decomposer(self):
+        self.decomposer = registry.get_decomposer(**self.decomposer_options)
+        return self.decomposer
+
+    async def get_dictionary(self):
+        if self.dictionary is None:
+            await self.async_load(decomposer=False)
+
+        return self.dictionary
+
+    async def get_decomposer(self):
+        if self.decomposer is None:
+            await self.async_load(dictionary=False)
+
+        return self.decomposer
+
+    # Dictionary
+    async def definition_lookup(self, word, script_type=None):
+        dictionary = await self.get_dictionary()
+        return await self.run(dictionary.definition_lookup, word, script_type)
+
+    async def dictionary_search(self, character, character_type=None, search_type=None):
+        dictionary = await self.get_dictionary()
+        return await self.run(
+            dictionary.dictionary_search, character, character_type, search_type
+        )
+
+    async def get_examples(self, character):
+        dictionary = await self.get_dictionary()
+        return await self.run(dictionary.get_examples, character)
+
+    async def get_pinyin(self, character):
+        dictionary = await self.get_dictionary()
+        return await self.run(dictionary.get_pinyin, character)
+
+    async def determine_phonetic_regularity(self, decomposition):
+        dictionary = await self.get_dictionary()
+        return await self.run(dictionary.determine_phonetic_regularity, decomposition)
+
+    async def segment(self, phrase):
+        dictionary = await self.get_dictionary()
+        return await self.run(dictionary.segment, phrase)
+
+    # Decomposer
+    async def decompose(self, character, decomposition_type=None):
+        decomposer = await self.get_decomposer()
+        return await self.run(decomposer.decompose, character, decomposition_type)
+
+    async def decompose_many(self, characterstring, decomposition_type=None):
+        decomposer = await self.get_decomposer()
+        return await self.run(
+            decomposer.decompose_many, characterstring, decomposition_type
+        )
+
+    async def get_characters_with_component(self, component):
+        decomposer = await self.get_decomposer()
+        return await self.run(decomposer.get_characters_with_component, component)
+
+    async def aiter_decompose(
+        self, texts, decomposition_type=None, batch_size=BATCH_SIZE
+    ):
+        """
+        Streaming decompose_many: async iterator over the
+        (character, decomposition) pairs of HanziDecomposer.iter_decompose,
+        computed batch_size at a time in the executor.
+        """
+        decomposer = await self.get_decomposer()
+        pairs = decomposer.iter_decompose(texts, decomposition_type)
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await loop.run_in_executor(
+                self.executor, list, islice(pairs, batch_size)
+            )
+            if not batch:
+                return
+
+            for pair in batch:
+                yield pair
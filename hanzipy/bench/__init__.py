@@ -0,0 +1,8 @@
+# coding:utf-8
+"""
+hanzipy benchmarks.
+
+``python -m hanzipy.bench`` runs the reproducible suite of hanzipy.bench.suite,
+``python -m hanzipy.bench --micro`` the implementation comparisons
+of hanzipy.bench.micro. See ``python -m hanzipy.bench --help``.
+"""
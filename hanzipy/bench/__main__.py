@@ -0,0 +1,67 @@
+# coding:utf-8
+import argparse
+import sys
+
+from hanzipy.bench import micro, suite
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m hanzipy.bench", description="hanzipy benchmarks"
+    )
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help="operations to run, all by default: {}".format(", ".join(suite.SUITE)),
+    )
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument(
+        "--baseline", help="JSON results to compare with, exits with 1 on regressions"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=suite.TOLERANCE,
+        help="relative slowdown reported as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-isolate",
+        action="store_true",
+        help="run every operation in this process",
+    )
+    parser.add_argument(
+        "--micro",
+        action="store_true",
+        help="run the micro benchmarks instead: {}".format(", ".join(micro.BENCHMARKS)),
+    )
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    options = parse_args(args)
+
+    if options.micro:
+        with suite.quiet_logging():
+            for name in options.names or micro.BENCHMARKS:
+                micro.report(name, micro.BENCHMARKS[name]())
+        return 0
+
+    results = suite.run_suite(options.names, isolate=not options.no_isolate)
+    changes = None
+    if options.baseline:
+        changes = suite.compare(
+            results, suite.read_json(options.baseline), options.tolerance
+        )
+
+    suite.print_results(results, changes)
+    if options.json:
+        suite.write_json(results, options.json)
+
+    if changes and any(change["regression"] for change in changes.values()):
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
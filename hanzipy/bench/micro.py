@@ -0,0 +1,650 @@
+# coding:utf-8
+"""
+Micro benchmarks comparing implementations of hanzipy hot paths.
+
+Run all of them with ``python -m hanzipy.bench --micro``
+or a subset with ``python -m hanzipy.bench --micro dictionary_startup``.
+"""
+import csv
+import io
+import itertools
+import json
+import tempfile
+import time
+from pathlib import Path
+
+# hanzipy package directory
+CURRENT_DIR = BASE_DIR = Path(__file__).parent.parent
+
+
+def timed(function, repeat=1):
+    """Returns the best wall time of repeat calls, in seconds."""
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def frequency_characters(limit=None):
+    """Characters of chinese_charfreq_simpl_trad.csv, most frequent first."""
+    filepath = "{}/data/chinese_charfreq_simpl_trad.csv".format(CURRENT_DIR)
+    with open(filepath, encoding="utf-8") as freq_file:
+        csvreader = csv.reader(freq_file)
+        next(csvreader, None)  # skip the headers
+
+        return [row[1] for row in itertools.islice(csvreader, limit)]
+
+
+def report(name, results):
+    print(name)
+    for label, seconds in results.items():
+        print("    {:<32}{:>14.4f} ms".format(label, seconds * 1000))
+
+
+def bench_dictionary_startup(repeat=3):
+    from hanzipy.dictionary import HanziDictionary
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_path = Path(tmp_dir) / "dictionary.snapshot"
+        # builds the snapshot
+        HanziDictionary(snapshot_path=snapshot_path)
+
+        return {
+            "cold parse": timed(
+                lambda: HanziDictionary(use_snapshot=False), repeat
+            ),
+            "snapshot load": timed(
+                lambda: HanziDictionary(snapshot_path=snapshot_path), repeat
+            ),
+        }
+
+
+def bench_ccedict_parse(repeat=3):
+    from hanzipy.ccedict import CCEDICT_STARTING_LINE, load_ccedict
+
+    filepath = "{}/data/cedict_ts.u8".format(CURRENT_DIR)
+
+    def readlines_parse():
+        # compute_dictionary before the single pass parser, verbatim
+        # but for the dictionaries it fills and the frequency data it loads
+        dictionary_simplified = {}
+        dictionary_traditional = {}
+
+        with open(filepath, encoding="utf-8") as ccedict_file:
+            lines = ccedict_file.readlines()
+
+            def next_traditional_char(idx):
+                if idx < len(lines):
+                    nextcharacter = lines[idx].split(" ")
+                    nextcheck = nextcharacter[0]
+                    return nextcheck
+
+                return ""
+
+            def next_simplified_char(idx):
+                if idx < len(lines):
+                    nextcharacter = lines[idx].split(" ")
+                    nextcheck = nextcharacter[1]
+                    return nextcheck
+
+                return ""
+
+            def get_elements(line):
+                openbracket = line.index("[")
+                closebracket = line.index("]")
+                defStart = line.index("/")
+                defClose = line.rindex("/")
+                pinyin = line[openbracket + 1 : closebracket]
+                definition = line[defStart + 1 : defClose]
+                elements = line.split(" ")
+                traditional = elements[0]
+                simplified = elements[1]
+
+                element = {
+                    "traditional": traditional,
+                    "simplified": simplified,
+                    "pinyin": pinyin,
+                    "definition": definition,
+                }
+
+                return element
+
+            for idx, line in enumerate(lines[CCEDICT_STARTING_LINE:]):
+                hanzi_dict = [get_elements(line)]
+
+                while hanzi_dict[0]["traditional"] == next_traditional_char(
+                    idx + 1
+                ) and hanzi_dict[0]["simplified"] == next_simplified_char(idx + 1):
+                    hanzi_dict.append(get_elements(idx + 1))
+                    idx += 1
+
+                simplified = dictionary_simplified.get(hanzi_dict[0]["simplified"])
+                traditional = dictionary_traditional.get(hanzi_dict[0]["traditional"])
+
+                if simplified:
+                    newhanzi_dict = simplified
+                    for element in hanzi_dict:
+                        newhanzi_dict.append(element)
+
+                    dictionary_simplified[hanzi_dict[0]["simplified"]] = newhanzi_dict
+                elif traditional:
+                    newhanzi_dict = traditional
+
+                    for element in hanzi_dict:
+                        newhanzi_dict.append(element)
+
+                    dictionary_traditional[hanzi_dict[0]["traditional"]] = newhanzi_dict
+                else:
+                    dictionary_simplified[hanzi_dict[0]["simplified"]] = hanzi_dict
+                    dictionary_traditional[hanzi_dict[0]["traditional"]] = hanzi_dict
+
+    def single_pass_parse():
+        with open(filepath, encoding="utf-8") as ccedict_file:
+            load_ccedict(ccedict_file)
+
+    return {
+        "readlines parse": timed(readlines_parse, repeat),
+        "single pass parse": timed(single_pass_parse, repeat),
+    }
+
+
+def bench_dictionary_search(queries=200):
+    from hanzipy.dictionary import HanziDictionary
+
+    dictionary = HanziDictionary()
+    characters = dictionary.character_frequency_count_index[:queries]
+
+    def search(method, character_type=None):
+        def run():
+            for character in characters:
+                method(character, character_type)
+
+        return timed(run) / len(characters)
+
+    return {
+        "regex search / query": search(dictionary.regex_search),
+        "index search / query": search(dictionary.index_search),
+        "regex search only / query": search(dictionary.regex_search, "only"),
+        "index search only / query": search(dictionary.index_search, "only"),
+    }
+
+
+def bench_prefix_search(queries=200):
+    from hanzipy.dictionary import HanziDictionary
+
+    dictionary = HanziDictionary()
+    prefixes = dictionary.character_frequency_count_index[:queries]
+    word_trie = dictionary.word_trie
+    text = "".join(dictionary.character_frequency_count_index[:2000])
+
+    def scan_prefix_search():
+        for prefix in prefixes:
+            sorted(
+                set(
+                    word
+                    for dictionary_words in (
+                        dictionary.dictionary_simplified,
+                        dictionary.dictionary_traditional,
+                    )
+                    for word in dictionary_words
+                    if word.startswith(prefix)
+                )
+            )
+
+    def trie_prefix_search():
+        for prefix in prefixes:
+            word_trie.prefix_search(prefix)
+
+    def longest_prefixes():
+        for start in range(len(text)):
+            word_trie.longest_prefix(text, start)
+
+    return {
+        "keys scan / prefix": timed(scan_prefix_search) / len(prefixes),
+        "trie / prefix": timed(trie_prefix_search) / len(prefixes),
+        "trie longest_prefix / character": timed(longest_prefixes) / len(text),
+    }
+
+
+def bench_segment(size=1 << 20):
+    from hanzipy.dictionary import HanziDictionary
+
+    filepath = "{}/data/sample_text.txt".format(CURRENT_DIR)
+    with open(filepath, encoding="utf-8") as sample_file:
+        sample = sample_file.read()
+
+    text = sample * (size // len(sample.encode("utf-8")) + 1)
+    megabytes = len(text.encode("utf-8")) / (1 << 20)
+    dictionary = HanziDictionary()
+    segmenter = dictionary.segmenter
+
+    def iter_segment():
+        for _ in segmenter.iter_segment(io.StringIO(text)):
+            pass
+
+    return {
+        "segment / MB": timed(lambda: segmenter.segment(text)) / megabytes,
+        "iter_segment / MB": timed(iter_segment) / megabytes,
+        "segment lines / MB": timed(
+            lambda: segmenter.segment_many(text.splitlines())
+        )
+        / megabytes,
+    }
+
+
+def bench_result_cache(queries=20000, characters=3000):
+    import random
+
+    from hanzipy.cache import LRUCache, SQLiteCache, TieredCache
+    from hanzipy.dictionary import HanziDictionary
+
+    uncached_dictionary = HanziDictionary()
+    vocabulary = [
+        character
+        for character in uncached_dictionary.character_frequency_count_index[
+            :characters
+        ]
+        if character in uncached_dictionary.simplified_index
+    ]
+    # Zipfian traffic: the n-th most frequent character is asked 1/n as often
+    workload = random.Random(0).choices(
+        vocabulary,
+        weights=[1 / rank for rank in range(1, len(vocabulary) + 1)],
+        k=queries,
+    )
+
+    def run(dictionary):
+        def queries():
+            for character in workload:
+                dictionary.dictionary_search(character)
+
+        return timed(queries) / len(workload)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        lru_dictionary = HanziDictionary(caches={"dictionary_search": LRUCache(1024)})
+        sqlite_dictionary = HanziDictionary(
+            caches={
+                "dictionary_search": TieredCache(
+                    LRUCache(256), SQLiteCache(Path(tmp_dir) / "results.sqlite")
+                )
+            }
+        )
+        results = {
+            "no cache / query": run(uncached_dictionary),
+            "lru 1024 / query": run(lru_dictionary),
+            "lru 256 + sqlite / query": run(sqlite_dictionary),
+        }
+
+    hit_rate = lru_dictionary.cache_stats()["dictionary_search"]["hit_rate"]
+    results["lru 1024 ({:.0%} hits) / query".format(hit_rate)] = results.pop(
+        "lru 1024 / query"
+    )
+    return results
+
+
+def bench_get_examples(characters=5000):
+    from hanzipy.dictionary import HanziDictionary
+
+    dictionary = HanziDictionary()
+    characters = [
+        character
+        for character in dictionary.character_frequency_count_index[:characters]
+        if character in dictionary.simplified_index
+    ]
+
+    def get_examples(method):
+        def run():
+            for character in characters:
+                method(character)
+
+        return timed(run) / len(characters)
+
+    results = {
+        "compute_examples / character": get_examples(dictionary.compute_examples),
+        "precompute": timed(lambda: dictionary.precompute_examples(characters)),
+    }
+    results["cached get_examples / character"] = get_examples(dictionary.get_examples)
+
+    return results
+
+
+def bench_phonetic_regularity(characters=2000):
+    from hanzipy.decomposer import HanziDecomposer
+    from hanzipy.dictionary import HanziDictionary
+
+    dictionary = HanziDictionary()
+    decomposer = HanziDecomposer()
+    decompositions = [
+        decomposer.decompose(character)
+        for character in frequency_characters(characters)
+    ]
+
+    def loop():
+        for decomposition in decompositions:
+            dictionary.determine_phonetic_regularity(decomposition)
+
+    return {
+        "loop / character": timed(loop) / len(decompositions),
+        "batch / character": timed(
+            lambda: dictionary.determine_phonetic_regularities(decompositions)
+        )
+        / len(decompositions),
+    }
+
+
+def bench_regularity_scale(passes=20):
+    from hanzipy.dictionary import HanziDictionary
+    from hanzipy.pinyin import PinyinSyllable
+
+    dictionary = HanziDictionary()
+    pinyins = [
+        pinyin
+        for character in dictionary.character_frequency_count_index[:100]
+        for pinyin in dictionary.get_pinyin(character) or []
+    ]
+    pairs = [(a, b) for a in pinyins for b in pinyins] * passes
+
+    def allocating_regularity_scale(charpinyin, phonetic_pinyin):
+        # get_regularity_scale before interning, two new syllables per call
+        charpinyin = PinyinSyllable(charpinyin.lower())
+        phonetic_pinyin = PinyinSyllable(phonetic_pinyin.lower())
+
+        if charpinyin.syllable() == phonetic_pinyin.syllable():
+            if charpinyin.raw_syllable == phonetic_pinyin.raw_syllable:
+                return 1
+            return 2
+        if charpinyin.final() == phonetic_pinyin.final():
+            return 4
+        if charpinyin.initial() == phonetic_pinyin.initial():
+            return 3
+        return 0
+
+    def score(method):
+        def run():
+            for charpinyin, phonetic_pinyin in pairs:
+                method(charpinyin, phonetic_pinyin)
+
+        return timed(run) / len(pairs)
+
+    return {
+        "allocating syllables / pair": score(allocating_regularity_scale),
+        "interned matrix / pair": score(dictionary.get_regularity_scale),
+    }
+
+
+def bench_decomposer_startup(repeat=3):
+    from hanzipy.decomposer import HanziDecomposer
+
+    return {
+        "eager components": timed(
+            lambda: HanziDecomposer(lazy_components=False), repeat
+        ),
+        "lazy components": timed(lambda: HanziDecomposer(), repeat),
+        "lazy, first component query": timed(
+            lambda: HanziDecomposer().get_characters_with_component("勺"), repeat
+        ),
+    }
+
+
+def bench_compile_components(repeat=3):
+    import re
+
+    from hanzipy.decomposer import RADICAL_REGEX, HanziDecomposer
+
+    decomposer = HanziDecomposer()
+    decompositions = [
+        decomposer.decompose(character) for character in frequency_characters()
+    ]
+    noglyph = decomposer.noglyph
+
+    def list_scan_grouping():
+        # compile_all_components before the rewrite
+        characters_with_component = {}
+
+        for decomposition in decompositions:
+            character = decomposition["character"]
+
+            for component in decomposition["once"]:
+                if component not in characters_with_component:
+                    if component != noglyph:
+                        characters_with_component.setdefault(component, [])
+                        characters_with_component[component].append(character)
+
+                elif component != noglyph:
+                    characters_with_component[component].append(character)
+
+            for component in decomposition["radical"]:
+                if component not in characters_with_component:
+                    if component != noglyph and not re.search(
+                        RADICAL_REGEX.pattern, component
+                    ):
+                        characters_with_component.setdefault(component, [])
+                        if decomposer.is_unique(
+                            characters_with_component[component], character
+                        ):
+                            characters_with_component[component].append(character)
+
+    def single_lookup_grouping():
+        characters_with_component = {}
+
+        for decomposition in decompositions:
+            character = decomposition["character"]
+
+            for component in decomposition["once"]:
+                if component != noglyph:
+                    characters_with_component.setdefault(component, []).append(
+                        character
+                    )
+
+            for component in decomposition["radical"]:
+                if (
+                    component not in characters_with_component
+                    and component != noglyph
+                    and not RADICAL_REGEX.search(component)
+                ):
+                    characters_with_component[component] = [character]
+
+    return {
+        "list scan grouping": timed(list_scan_grouping, repeat),
+        "single lookup grouping": timed(single_lookup_grouping, repeat),
+        "compile_all_components": timed(decomposer.compile_all_components, repeat),
+    }
+
+
+def bench_radical_groups(passes=20):
+    from hanzipy.decomposer import HanziDecomposer
+
+    decomposer = HanziDecomposer(lazy_components=False)
+    radicals = list(decomposer.radicals) * passes
+
+    def rescan_radical_group(radical):
+        # get_characters_with_component before the meaning -> radicals map
+        meaning = decomposer.radicals[radical]
+        characters = []
+        for same_radical in decomposer.radicals:
+            if decomposer.radicals[same_radical] == meaning:
+                characters.extend(
+                    decomposer.characters_with_component.get(same_radical, ())
+                )
+
+        return characters
+
+    def query(method, **options):
+        def run():
+            for radical in radicals:
+                method(radical, **options)
+
+        return timed(run) / len(radicals)
+
+    return {
+        "rescan / query": query(rescan_radical_group),
+        "cached group list / query": query(decomposer.get_characters_with_component),
+        "cached group tuple / query": query(
+            decomposer.get_characters_with_component, immutable=True
+        ),
+    }
+
+
+def bench_component_index(passes=100):
+    from hanzipy.decomposer import HanziDecomposer
+
+    decomposer = HanziDecomposer()
+    start = time.perf_counter()
+    component_index = decomposer.component_index
+    build = time.perf_counter() - start
+    queries = [
+        {"all_of": ["氵", "木", "目"]},
+        {"all_of": ["口"], "limit": 20},
+        {"any_of": ["氵", "木"], "none_of": ["口"], "limit": 50},
+        {"all_of": ["亻", "口"], "none_of": ["木"], "limit": 100},
+    ]
+
+    def run():
+        for _ in range(passes):
+            for query in queries:
+                component_index.search(**query)
+
+    return {
+        "index build": build,
+        "query": timed(run) / (passes * len(queries)),
+        "unlimited 口 query": timed(lambda: component_index.intersect(["口"])),
+    }
+
+
+def bench_decomposition_memo(passes=3):
+    from hanzipy.decomposer import HanziDecomposer
+
+    characters = frequency_characters() * passes
+
+    def decompose_all(decomposer):
+        def run():
+            decomposer.clear_memo()
+            for character in characters:
+                decomposer.radical_decomposition(character)
+                decomposer.graphical_decomposition(character)
+
+        return timed(run) / len(characters)
+
+    return {
+        "no memo / character": decompose_all(HanziDecomposer(memo_size=0)),
+        "memo / character": decompose_all(HanziDecomposer()),
+    }
+
+
+def bench_instrumentation(passes=3):
+    from hanzipy.decomposer import HanziDecomposer
+
+    characters = frequency_characters() * passes
+
+    def decompose_all(decomposer):
+        def run():
+            decomposer.clear_memo()
+            for character in characters:
+                decomposer.decompose(character)
+
+        return timed(run) / len(characters)
+
+    return {
+        "instrumentation off / character": decompose_all(HanziDecomposer()),
+        "instrumentation on / character": decompose_all(
+            HanziDecomposer(instrumentation=True)
+        ),
+    }
+
+
+def bench_decompose(passes=3):
+    from hanzipy.decomposer import HanziDecomposer
+
+    decomposer = HanziDecomposer()
+    characters = frequency_characters(3000)
+    text = "".join(characters)
+
+    def json_round_trip():
+        for character in characters * passes:
+            json.loads(json.dumps(decomposer.decompose(character)))
+
+    def decompose():
+        for character in characters * passes:
+            decomposer.decompose(character)
+
+    def decompose_many():
+        for _ in range(passes):
+            decomposer.decompose_many(text)
+
+    # warm up the memos so that only the result building is measured
+    decompose()
+
+    return {
+        "decompose + json / character": timed(json_round_trip)
+        / (len(characters) * passes),
+        "decompose / character": timed(decompose) / (len(characters) * passes),
+        "decompose_many / character": timed(decompose_many)
+        / (len(characters) * passes),
+    }
+
+
+def bench_iter_decompose(size=1 << 22):
+    from hanzipy.decomposer import HanziDecomposer
+
+    decomposer = HanziDecomposer()
+    characters = frequency_characters(5000)
+    text = "".join(characters) * (size // len(characters))
+    lines = [text[i : i + 80] for i in range(0, len(text), 80)]
+
+    return {
+        "iter_decompose / MB": timed(
+            lambda: list(decomposer.iter_decompose(io.StringIO(text)))
+        )
+        * (1 << 20)
+        / len(text.encode("utf-8")),
+        "iter_decompose lines / MB": timed(
+            lambda: list(decomposer.iter_decompose(lines))
+        )
+        * (1 << 20)
+        / len(text.encode("utf-8")),
+    }
+
+
+def bench_parallel_scaling(size=1 << 24):
+    from hanzipy.parallel import ParallelDecomposer
+
+    characters = frequency_characters()
+    text = "".join(characters) * (size // len(characters))
+    results = {}
+
+    for workers in (1, 2, 4, 8):
+        with ParallelDecomposer(workers=workers) as parallel_decomposer:
+            results["{} workers / MB".format(workers)] = (
+                timed(lambda: parallel_decomposer.decompose_many([text]))
+                * (1 << 20)
+                / len(text.encode("utf-8"))
+            )
+
+    return results
+
+
+BENCHMARKS = {
+    "dictionary_startup": bench_dictionary_startup,
+    "ccedict_parse": bench_ccedict_parse,
+    "dictionary_search": bench_dictionary_search,
+    "prefix_search": bench_prefix_search,
+    "segment": bench_segment,
+    "result_cache": bench_result_cache,
+    "get_examples": bench_get_examples,
+    "phonetic_regularity": bench_phonetic_regularity,
+    "regularity_scale": bench_regularity_scale,
+    "decomposer_startup": bench_decomposer_startup,
+    "compile_components": bench_compile_components,
+    "radical_groups": bench_radical_groups,
+    "component_index": bench_component_index,
+    "decomposition_memo": bench_decomposition_memo,
+    "instrumentation": bench_instrumentation,
+    "decompose": bench_decompose,
+    "iter_decompose": bench_iter_decompose,
+    "parallel_scaling": bench_parallel_scaling,
+}
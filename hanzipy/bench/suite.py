@@ -0,0 +1,325 @@
+# coding:utf-8
+"""
+Reproducible benchmark suite of hanzipy hot paths.
+
+Every operation runs over fixed inputs, drawn from the Junda frequency list
+(leiden_freq_variants_removed.txt) and chinese_charfreq_simpl_trad.csv,
+in a process of its own, and reports its throughput, latency percentiles
+and the peak RSS of that process.
+"""
+import csv
+import json
+import logging
+import math
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context
+from pathlib import Path
+
+from hanzipy.util import __version__
+
+# hanzipy package directory
+CURRENT_DIR = BASE_DIR = Path(__file__).parent.parent
+SEED = 0
+# Most frequent characters, then characters sampled from the rest of the list
+TOP_CHARACTERS = 500
+SAMPLED_CHARACTERS = 500
+STARTUP_RUNS = 5
+# Measured passes over the inputs, after a warm up one
+ROUNDS = 5
+# Relative slowdown of ops/sec or p50 reported as a regression
+TOLERANCE = 0.10
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def junda_characters():
+    """Characters of leiden_freq_variants_removed.txt, most frequent first."""
+    filepath = "{}/data/leiden_freq_variants_removed.txt".format(CURRENT_DIR)
+    with open(filepath, encoding="utf-8") as junda_file:
+        return [line.split("\t")[1] for line in junda_file if line.strip()]
+
+
+def csv_characters():
+    """Characters of chinese_charfreq_simpl_trad.csv, most frequent first."""
+    filepath = "{}/data/chinese_charfreq_simpl_trad.csv".format(CURRENT_DIR)
+    with open(filepath, encoding="utf-8") as freq_file:
+        csvreader = csv.reader(freq_file)
+        next(csvreader, None)  # skip the headers
+
+        return [row[1] for row in csvreader]
+
+
+def fixed_inputs(characters):
+    """The TOP_CHARACTERS first characters, and SAMPLED_CHARACTERS others."""
+    top = characters[:TOP_CHARACTERS]
+    rest = characters[TOP_CHARACTERS:]
+
+    return top + random.Random(SEED).sample(rest, min(SAMPLED_CHARACTERS, len(rest)))
+
+
+def peak_rss():
+    """Peak resident set size of this process, in kB, None if unknown."""
+    if resource is None:
+        return
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of already sorted values."""
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def measure(function, inputs):
+    """Calls function on every input, returns the latency of each call, in ns."""
+    latencies = []
+    clock = time.perf_counter_ns
+
+    for value in inputs:
+        start = clock()
+        function(value)
+        latencies.append(clock() - start)
+
+    return latencies
+
+
+# Operations: name -> function returning the function to measure, its inputs,
+# and the function resetting its caches before each pass, or None.
+# Startup operations get a single pass. Loading the data is part of the setup,
+# not of the measures.
+def setup_dictionary_startup():
+    from hanzipy.dictionary import HanziDictionary
+
+    # the snapshot is built if needed
+    HanziDictionary()
+    return (lambda _: HanziDictionary()), range(STARTUP_RUNS), None
+
+
+def setup_decomposer_startup():
+    from hanzipy.decomposer import HanziDecomposer
+
+    return (lambda _: HanziDecomposer()), range(STARTUP_RUNS), None
+
+
+def setup_decompose():
+    from hanzipy.decomposer import HanziDecomposer
+
+    decomposer = HanziDecomposer()
+    return decomposer.decompose, fixed_inputs(csv_characters()), decomposer.clear_memo
+
+
+def setup_dictionary_search():
+    from hanzipy.dictionary import HanziDictionary
+
+    dictionary = HanziDictionary()
+    return dictionary.dictionary_search, fixed_inputs(junda_characters()), None
+
+
+def setup_get_examples():
+    from hanzipy.dictionary import HanziDictionary
+
+    dictionary = HanziDictionary()
+    characters = [
+        character
+        for character in fixed_inputs(junda_characters())
+        if character in dictionary.simplified_index
+    ]
+    return dictionary.get_examples, characters, dictionary.examples.clear
+
+
+def setup_determine_phonetic_regularity():
+    from hanzipy.decomposer import HanziDecomposer
+    from hanzipy.dictionary import HanziDictionary
+
+    decomposer = HanziDecomposer()
+    dictionary = HanziDictionary(decomposer=decomposer)
+    decompositions = [
+        decomposer.decompose(character)
+        for character in fixed_inputs(csv_characters())
+    ]
+    return dictionary.determine_phonetic_regularity, decompositions, None
+
+
+def setup_segment():
+    from hanzipy.dictionary import HanziDictionary
+
+    dictionary = HanziDictionary()
+    # builds the segmenter
+    dictionary.segment("")
+    filepath = "{}/data/sample_text.txt".format(CURRENT_DIR)
+    with open(filepath, encoding="utf-8") as sample_file:
+        sentences = [
+            sentence
+            for line in sample_file
+            for sentence in line.strip().split("。")
+            if sentence
+        ]
+
+    return dictionary.segment, sentences * 20, None
+
+
+@contextmanager
+def quiet_logging(level=logging.WARNING):
+    """Raises the level of the hanzipy loggers for the duration of a benchmark."""
+    logger = logging.getLogger("hanzipy")
+    previous_level = logger.level
+    logger.setLevel(level)
+
+    try:
+        yield
+    finally:
+        logger.setLevel(previous_level)
+
+
+STARTUP_OPERATIONS = {"dictionary_startup", "decomposer_startup"}
+SUITE = {
+    "dictionary_startup": setup_dictionary_startup,
+    "decomposer_startup": setup_decomposer_startup,
+    "decompose": setup_decompose,
+    "dictionary_search": setup_dictionary_search,
+    "get_examples": setup_get_examples,
+    "determine_phonetic_regularity": setup_determine_phonetic_regularity,
+    "segment": setup_segment,
+}
+
+
+def run_operation(name):
+    with quiet_logging():
+        function, inputs, reset = SUITE[name]()
+        inputs = list(inputs)
+        latencies = []
+
+        if name in STARTUP_OPERATIONS:
+            latencies = measure(function, inputs)
+        else:
+            for round_number in range(ROUNDS + 1):
+                if reset is not None:
+                    reset()
+
+                round_latencies = measure(function, inputs)
+                # the first pass warms up
+                if round_number:
+                    latencies.extend(round_latencies)
+
+    total = sum(latencies)
+    latencies.sort()
+
+    return {
+        "calls": len(latencies),
+        "ops_per_sec": len(latencies) / (total / 1e9) if total else 0.0,
+        "p50_ms": percentile(latencies, 0.50) / 1e6,
+        "p99_ms": percentile(latencies, 0.99) / 1e6,
+        "peak_rss_kb": peak_rss(),
+    }
+
+
+def run_suite(names=None, isolate=True):
+    """
+    Runs the operations of names, all of SUITE by default.
+
+    isolate: run each operation in a new process, so that its peak RSS
+    is its own and caches don't leak from one operation to the next.
+    """
+    results = {}
+
+    for name in names or SUITE:
+        if name not in SUITE:
+            raise ValueError("Unknown benchmark {}".format(name))
+
+        if isolate:
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+                results[name] = executor.submit(run_operation, name).result()
+        else:
+            results[name] = run_operation(name)
+
+    return {
+        "meta": {
+            "hanzipy": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": SEED,
+            "isolated": isolate,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Relative changes of each operation against baseline,
+    name -> {"ops_per_sec": change, "p50_ms": change, "p99_ms": change,
+    "regression": bool}. Higher ops/sec and lower latencies are better.
+    """
+    changes = {}
+
+    for name, result in results["results"].items():
+        reference = baseline["results"].get(name)
+        if not reference:
+            continue
+
+        change = {
+            key: (result[key] - reference[key]) / reference[key]
+            if reference[key]
+            else 0.0
+            for key in ("ops_per_sec", "p50_ms", "p99_ms")
+        }
+        change["regression"] = (
+            change["ops_per_sec"] < -tolerance or change["p50_ms"] > tolerance
+        )
+        changes[name] = change
+
+    return changes
+
+
+def print_results(results, changes=None):
+    print(
+        "{:<32}{:>14}{:>12}{:>12}{:>14}".format(
+            "operation", "ops/sec", "p50 ms", "p99 ms", "peak RSS kB"
+        )
+    )
+
+    for name, result in results["results"].items():
+        print(
+            "{:<32}{:>14.1f}{:>12.4f}{:>12.4f}{:>14}".format(
+                name,
+                result["ops_per_sec"],
+                result["p50_ms"],
+                result["p99_ms"],
+                result["peak_rss_kb"] if result["peak_rss_kb"] is not None else "-",
+            )
+        )
+
+        change = (changes or {}).get(name)
+        if change:
+            print(
+                "{:<32}{:>+14.1%}{:>+12.1%}{:>+12.1%}{}".format(
+                    "  vs baseline",
+                    change["ops_per_sec"],
+                    change["p50_ms"],
+                    change["p99_ms"],
+                    "  REGRESSION" if change["regression"] else "",
+                )
+            )
+
+
+def write_json(results, filepath):
+    with open(filepath, "w", encoding="utf-8") as json_file:
+        json.dump(results, json_file, indent=2, ensure_ascii=False)
+
+
+def read_json(filepath):
+    with open(filepath, encoding="utf-8") as json_file:
+        return json.load(json_file)
@@ -0,0 +1,243 @@
+# coding:utf-8
+"""
+Result caches for HanziDictionary queries.
+
+Every cache has the same small interface, get(key, default), set(key, value),
+clear() and stats(), so that they can be configured per method and stacked.
+Keys are strings.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+LRU_SIZE = 4096
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self, size):
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": size,
+        }
+
+
+class LRUCache:
+    """
+    In-process cache of at most maxsize entries, the least recently used
+    one being evicted first. Entries older than ttl seconds expire,
+    None for no expiry. Safe to share between threads.
+    """
+
+    def __init__(self, maxsize=LRU_SIZE, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expiry time or None, value)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = CacheStats()
+
+    def get(self, key, default=MISSING):
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.counters.misses += 1
+                return default
+
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                del self.entries[key]
+                self.counters.expirations += 1
+                self.counters.misses += 1
+                return default
+
+            self.entries.move_to_end(key)
+            self.counters.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        expiry = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self.lock:
+            self.entries[key] = (expiry, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.counters.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        return self.counters.as_dict(len(self.entries))
+
+
+class SQLiteCache:
+    """
+    On-disk cache in a SQLite database, shared by every process and thread
+    using the same path. Values are pickled.
+
+    Entries older than ttl seconds expire, None for no expiry.
+    Past max_entries, the oldest entries are evicted.
+    Statistics are the ones of this instance only.
+    """
+
+    def __init__(self, path, ttl=None, max_entries=None):
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.counters = CacheStats()
+
+        with self.connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value BLOB, created REAL, expiry REAL)"
+            )
+
+    def connection(self):
+        # sqlite3 connections can't be shared between threads
+        connection = getattr(self.local, "connection", None)
+
+        if connection is None:
+            # imported on first use, HanziDictionary imports this module
+            import sqlite3
+
+            connection = self.local.connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+
+        return connection
+
+    def count(self, name):
+        with self.lock:
+            setattr(self.counters, name, getattr(self.counters, name) + 1)
+
+    def get(self, key, default=MISSING):
+        row = (
+            self.connection()
+            .execute("SELECT value, expiry FROM results WHERE key = ?", (key,))
+            .fetchone()
+        )
+
+        if row is None:
+            self.count("misses")
+            return default
+
+        if row[1] is not None and row[1] <= time.time():
+            self.connection().execute("DELETE FROM results WHERE key = ?", (key,))
+            self.count("expirations")
+            self.count("misses")
+            return default
+
+        self.count("hits")
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        connection = self.connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (
+                key,
+                pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                now,
+                now + self.ttl if self.ttl is not None else None,
+            ),
+        )
+
+        if self.max_entries is not None:
+            evicted = connection.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results "
+                "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+
+            with self.lock:
+                self.counters.evictions += max(evicted, 0)
+
+    def clear(self):
+        self.connection().execute("DELETE FROM results")
+
+    def stats(self):
+        size = self.connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return self.counters.as_dict(size)
+
+
+class TieredCache:
+    """
+    Caches looked up in order, typically a LRUCache in front of a SQLiteCache.
+    A value found in a later cache is copied into the earlier ones.
+    """
+
+    def __init__(self, *caches):
+        self.caches = caches
+
+    def get(self, key, default=MISSING):
+        for position, cache in enumerate(self.caches):
+            value = cache.get(key, MISSING)
+
+            if value is not MISSING:
+                for earlier_cache in self.caches[:position]:
+                    earlier_cache.set(key, value)
+
+                return value
+
+        return default
+
+    def set(self, key, value):
+        for cache in self.caches:
+            cache.set(key, value)
+
+    def clear(self):
+        for cache in self.caches:
+            cache.clear()
+
+    def stats(self):
+        return [cache.stats() for cache in self.caches]
+
+
+class CachedMethod:
+    """
+    Wraps a method so that its results are looked up in cache first.
+
+    Keys are the repr of the method name and arguments.
+    copy, if given, is applied to every returned value but None,
+    so that callers can't alter the cached one.
+    """
+
+    def __init__(self, method, cache, copy=None):
+        self.method = method
+        self.cache = cache
+        self.copy = copy
+        self.name = method.__name__
+
+    def __call__(self, *args, **kwargs):
+        key = repr((self.name, args, sorted(kwargs.items())))
+        result = self.cache.get(key, MISSING)
+
+        if result is MISSING:
+            result = self.method(*args, **kwargs)
+            self.cache.set(key, result)
+
+        if self.copy is None or result is None:
+            return result
+
+        return self.copy(result)
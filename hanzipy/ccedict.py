@@ -0,0 +1,74 @@
+# coding:utf-8
+from itertools import islice
+
+CCEDICT_STARTING_LINE = 30
+
+
+def parse_ccedict_line(line):
+    """
+    Entry of a CC-CEDICT line:
+    Traditional Simplified [pin1 yin1] /English equivalent 1/equivalent 2/
+    """
+    traditional, simplified, rest = line.split(" ", 2)
+
+    return {
+        "traditional": traditional,
+        "simplified": simplified,
+        "pinyin": rest[rest.index("[") + 1 : rest.index("]")],
+        "definition": rest[rest.index("/") + 1 : rest.rindex("/")],
+    }
+
+
+def iter_ccedict_groups(lines, starting_line=CCEDICT_STARTING_LINE):
+    """
+    Single pass over lines, an iterable such as an open CC-CEDICT file,
+    yielding the lists of consecutive entries sharing
+    the same traditional and simplified words.
+
+    Lines before starting_line are the file header and are skipped.
+    """
+    group = []
+    group_key = None
+
+    for line in islice(lines, starting_line, None):
+        entry = parse_ccedict_line(line)
+        key = (entry["traditional"], entry["simplified"])
+
+        if key != group_key:
+            if group:
+                yield group
+            group = []
+            group_key = key
+
+        group.append(entry)
+
+    if group:
+        yield group
+
+
+def load_ccedict(lines, starting_line=CCEDICT_STARTING_LINE):
+    """
+    Simplified and traditional word -> entries maps of a CC-CEDICT file.
+
+    Entries of a word already known by its simplified form,
+    or else by its traditional one, are added to that word's entries.
+    Otherwise both maps share the new list of entries.
+    """
+    dictionary_simplified = {}
+    dictionary_traditional = {}
+
+    for group in iter_ccedict_groups(lines, starting_line):
+        simplified = dictionary_simplified.get(group[0]["simplified"])
+        if simplified:
+            simplified.extend(group)
+            continue
+
+        traditional = dictionary_traditional.get(group[0]["traditional"])
+        if traditional:
+            traditional.extend(group)
+            continue
+
+        dictionary_simplified[group[0]["simplified"]] = group
+        dictionary_traditional[group[0]["traditional"]] = group
+
+    return dictionary_simplified, dictionary_traditional
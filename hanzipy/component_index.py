@@ -0,0 +1,178 @@
+# coding:utf-8
+import csv
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+CURRENT_DIR = BASE_DIR = Path(__file__).parent
+BITSET_CACHE_SIZE = 1024
+
+
+class ComponentIndex:
+    """
+    Transitive component -> characters index of the decomposition data.
+
+    A character is listed under every component of its whole decomposition
+    tree, not only the ones it directly decomposes into.
+
+    Characters get ids by rank: the ones of chinese_charfreq_simpl_trad.csv
+    first, most frequent first, then the others in decomposition data order.
+    Posting lists are sorted arrays of ids, so results come out ranked.
+    Queries turn them into int bitsets, cached for the most used components.
+    """
+
+    def __init__(self, decomposer, bitset_cache_size=BITSET_CACHE_SIZE):
+        self.decomposer = decomposer
+        self.characters = self.ranked_characters()
+        self.ids = {
+            character: char_id for char_id, character in enumerate(self.characters)
+        }
+        # component -> sorted ids of the characters containing it
+        self.postings = {}
+        self.all_characters = (1 << len(self.characters)) - 1
+        self.bitset_cache_size = bitset_cache_size
+        self.bitset = lru_cache(maxsize=bitset_cache_size)(self.compute_bitset)
+        self.build_postings()
+
+    def __getstate__(self):
+        # the bitset cache wraps a bound method, it is rebuilt on load
+        state = self.__dict__.copy()
+        del state["bitset"]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.bitset = lru_cache(maxsize=self.bitset_cache_size)(self.compute_bitset)
+
+    def ranked_characters(self):
+        characters = [
+            character
+            for character in self.decomposer.characters
+            if not character.isdigit()
+        ]
+        decomposition_characters = set(characters)
+        ranked = {}
+
+        filepath = "{}/data/chinese_charfreq_simpl_trad.csv".format(CURRENT_DIR)
+        with open(filepath, encoding="utf-8") as freq_file:
+            csvreader = csv.reader(freq_file)
+            next(csvreader, None)  # skip the headers
+
+            for row in csvreader:
+                if row[1] in decomposition_characters:
+                    ranked[row[1]] = None
+
+        for character in characters:
+            ranked[character] = None
+
+        return list(ranked)
+
+    def build_postings(self):
+        get_components = self.decomposer.get_components
+        # node -> components of its whole decomposition tree
+        descendants = {}
+
+        def components_of(node):
+            node_components = descendants.get(node)
+            if node_components is not None:
+                return node_components
+
+            node_components = set()
+            # cycle guard, a node is never its own component
+            descendants[node] = node_components
+
+            components = get_components(node)
+            if components != node:
+                for component in components:
+                    if component == node:
+                        continue
+
+                    if not component.isdigit():
+                        node_components.add(component)
+                    node_components.update(components_of(component))
+
+            node_components.discard(node)
+            return node_components
+
+        postings = {}
+        for char_id, character in enumerate(self.characters):
+            for component in components_of(character):
+                posting = postings.get(component)
+                if posting is None:
+                    posting = postings[component] = array("I")
+                posting.append(char_id)
+
+        self.postings = postings
+
+    def compute_bitset(self, component):
+        posting = self.postings.get(component)
+        if posting is None:
+            return 0
+
+        bits = bytearray((posting[-1] >> 3) + 1)
+        for char_id in posting:
+            bits[char_id >> 3] |= 1 << (char_id & 7)
+
+        return int.from_bytes(bits, "little")
+
+    def ranked(self, bitset, limit=None):
+        """Characters of a bitset, most frequent first."""
+        characters = self.characters
+        result = []
+        start = 0
+        window = 1024
+
+        # read windows of growing size from the least significant bit,
+        # so that a limited query never converts the whole bitset
+        while bitset >> start and (limit is None or len(result) < limit):
+            bits = bin((bitset >> start) & ((1 << window) - 1))[:1:-1]
+            offset = bits.find("1")
+
+            while offset != -1 and (limit is None or len(result) < limit):
+                result.append(characters[start + offset])
+                offset = bits.find("1", offset + 1)
+
+            start += window
+            window <<= 1
+
+        return result
+
+    def search(self, all_of=(), any_of=(), none_of=(), limit=None):
+        """
+        Characters containing every component of all_of,
+        at least one of any_of and none of none_of, most frequent first.
+        """
+        bitset = self.all_characters
+
+        for component in sorted(all_of, key=self.count):
+            bitset &= self.bitset(component)
+            if not bitset:
+                return []
+
+        if any_of:
+            any_bitset = 0
+            for component in any_of:
+                any_bitset |= self.bitset(component)
+            bitset &= any_bitset
+
+        for component in none_of:
+            bitset &= ~self.bitset(component)
+
+        return self.ranked(bitset, limit)
+
+    def intersect(self, components, exclude=(), limit=None):
+        if not components:
+            return []
+
+        return self.search(all_of=components, none_of=exclude, limit=limit)
+
+    def union(self, components, exclude=(), limit=None):
+        if not components:
+            return []
+
+        return self.search(any_of=components, none_of=exclude, limit=limit)
+
+    def count(self, component):
+        """Number of characters containing component."""
+        return len(self.postings.get(component, ()))
@@ -0,0 +1,43 @@
+# coding:utf-8
+from types import MappingProxyType
+
+
+class FrozenDataset:
+    """
+    Read-only bundle of loaded data, made by HanziDictionary.freeze()
+    or HanziDecomposer.freeze().
+
+    Its attributes can't be set or deleted, and the views built over it,
+    HanziDictionary(dataset=...) or HanziDecomposer(dataset=...),
+    never write into the objects it holds: they keep their own caches,
+    and the lists and dicts they return are copies.
+    One dataset can therefore be shared by any number of threads and views,
+    without copies and without locks.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, **values):
+        object.__setattr__(self, "values", MappingProxyType(values))
+
+    def __getattr__(self, name):
+        try:
+            return self.values[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenDataset is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenDataset is read-only")
+
+    def __reduce__(self):
+        return (rebuild_dataset, (dict(self.values),))
+
+    def __repr__(self):
+        return "FrozenDataset({})".format(", ".join(self.values))
+
+
+def rebuild_dataset(values):
+    return FrozenDataset(**values)
@@ -3,54 +3,229 @@ import csv
 import json
 import logging
 import re
+from functools import lru_cache
 from pathlib import Path
 
+from hanzipy.component_index import ComponentIndex
+from hanzipy.dataset import FrozenDataset
+from hanzipy.decomposition_store import (
+    load_mapped_decomposition,
+    parse_decomposition_line,
+)
 from hanzipy.exceptions import NotAHanziCharacter
+from hanzipy.instrumentation import get_instrumentation
+from hanzipy.snapshot import SNAPSHOT_DIR
+from hanzipy.util import iter_file_chunks
 
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
 
-RADICAL_REGEX = r"[一丨丶⺀丿乙⺃乚⺄亅丷]"
+RADICAL_REGEX = re.compile(r"[一丨丶⺀丿乙⺃乚⺄亅丷]")
+HANZI_REGEX = re.compile("[\u4e00-\u9fff]")
 CURRENT_DIR = BASE_DIR = Path(__file__).parent
+COMPILED_DECOMPOSITION = SNAPSHOT_DIR / "cjk_decomp.bin"
+MEMO_SIZE = 65536
+# lru_cache memos of the compute_* methods
+MEMOIZED_METHODS = ["radical_components", "graphical_components", "number_components"]
+# Methods timed when instrumentation is on
+INSTRUMENTED_METHODS = [
+    "init_decomposition",
+    "compile_all_components",
+    "decompose",
+    "decompose_many",
+    "once_decomposition",
+    "radical_decomposition",
+    "graphical_decomposition",
+    "compute_radical_components",
+    "compute_graphical_components",
+    "get_characters_with_component",
+]
 
 
 class HanziDecomposer:
-    def __init__(self):
+    def __init__(
+        self,
+        store="dict",
+        compiled_path=None,
+        lazy_components=True,
+        memo_size=MEMO_SIZE,
+        dataset=None,
+        instrumentation=None,
+    ):
+        """
+        store: "dict" parses cjk_decomp.txt into Python dicts.
+        "mmap" memory maps a compact binary copy of it instead,
+        compiled on first use to compiled_path (COMPILED_DECOMPOSITION by default),
+        so that processes on the same host share the same physical pages.
+
+        lazy_components: build characters_with_component on first use
+        instead of in the constructor.
+
+        memo_size: number of resolved radical and graphical decompositions
+        memoized per node, in a LRU. None for an unbounded memo, 0 to disable it.
+
+        dataset: FrozenDataset returned by freeze(). The decomposer is then
+        a view over its data, with its own memos, nothing is loaded nor copied.
+
+        instrumentation: True, or a hanzipy.instrumentation.Instrumentation,
+        to count and time the calls of INSTRUMENTED_METHODS, loading included.
+        compute_* calls are the memo misses, recursive ones included.
+        Off by default, at no cost.
+        """
+        self.store = store
+        self.compiled_path = compiled_path or COMPILED_DECOMPOSITION
         self.characters = {}
         self.radicals = {}
-        self.characters_with_component = {}
+        # Radicals sharing the same meaning, in radical_with_meanings.json order
+        self.radicals_by_meaning = {}
+        self._characters_with_component = None
+        self._component_index = None
+        # Meaning -> characters with any of its radicals, as a tuple
+        self.radical_group_characters = {}
         self.noglyph = "No glyph available"
-        self.init_decomposition()
-        self.compile_all_components()
+        self.memo_size = memo_size
+        self.instrumentation = get_instrumentation(instrumentation)
+        self.install_memos()
+
+        if dataset is not None:
+            self.use_dataset(dataset)
+        else:
+            self.init_decomposition()
+
+        if not lazy_components and self._characters_with_component is None:
+            self.compile_all_components()
+
+    def install_memos(self):
+        # before the memos, so that they call the timed compute_* methods
+        if self.instrumentation is not None:
+            self.instrumentation.instrument(self, INSTRUMENTED_METHODS)
+
+        # Fully resolved component tuples, shared by every decomposition
+        self.radical_components = lru_cache(maxsize=self.memo_size)(
+            self.compute_radical_components
+        )
+        self.graphical_components = lru_cache(maxsize=self.memo_size)(
+            self.compute_graphical_components
+        )
+        self.number_components = lru_cache(maxsize=self.memo_size)(
+            self.compute_number_components
+        )
+
+    def __getstate__(self):
+        # memos and timed methods wrap bound methods, the memory map
+        # can't be pickled either: they are rebuilt on load,
+        # the component index on its next use
+        state = self.__dict__.copy()
+        for name in MEMOIZED_METHODS + INSTRUMENTED_METHODS:
+            state.pop(name, None)
+
+        state["_component_index"] = None
+        if self.store == "mmap":
+            state["characters"] = None
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.characters is None:
+            self.characters = load_mapped_decomposition(
+                "{}/data/cjk_decomp.txt".format(CURRENT_DIR), self.compiled_path
+            )
+
+        self.install_memos()
+
+    @property
+    def characters_with_component(self):
+        if self._characters_with_component is None:
+            self.compile_all_components()
+
+        return self._characters_with_component
+
+    @characters_with_component.setter
+    def characters_with_component(self, characters_with_component):
+        self._characters_with_component = characters_with_component
+        # radical groups are built from it
+        self.radical_group_characters = {}
+
+    @property
+    def component_index(self):
+        """Transitive component index, built on first use."""
+        if self._component_index is None:
+            self._component_index = ComponentIndex(self)
+
+        return self._component_index
+
+    def freeze(self, component_index=False):
+        """
+        Read-only dataset of this decomposer, to share between threads
+        with HanziDecomposer(dataset=...).
+
+        Components are compiled first. component_index: build the transitive
+        component index first, so that it is part of the dataset.
+        """
+        if component_index:
+            self.component_index
+
+        return FrozenDataset(
+            store=self.store,
+            compiled_path=self.compiled_path,
+            characters=self.characters,
+            radicals=self.radicals,
+            radicals_by_meaning=self.radicals_by_meaning,
+            characters_with_component=self.characters_with_component,
+            component_index=self._component_index,
+        )
+
+    def use_dataset(self, dataset):
+        self.store = dataset.store
+        self.compiled_path = dataset.compiled_path
+        self.characters = dataset.characters
+        self.radicals = dataset.radicals
+        self.radicals_by_meaning = dataset.radicals_by_meaning
+        self._characters_with_component = dataset.characters_with_component
+        self._component_index = dataset.component_index
 
     def init_decomposition(
         self,
     ):
         # Reading in cjk_decomp - Decomposition Database
         decomp_filepath = "{}/data/cjk_decomp.txt".format(CURRENT_DIR)
-        with open(decomp_filepath, encoding="utf-8") as decomp_file:
-            lines = decomp_file.readlines()
-
-            for line in lines:
-                colonsplit = line.split(":")
-                character = colonsplit[0]
-                decomposition = colonsplit[1]
-                openbracket = decomposition.index("(")
-                closebracket = decomposition.index(")")
-                decomposition_type = decomposition[0:openbracket]
-                components = decomposition[openbracket + 1 : closebracket].split(
-                    ","
-                )  # noqa
-                self.characters[character] = {
-                    "decomposition_type": decomposition_type,
-                    "components": components,
-                }
+        if self.store == "mmap":
+            try:
+                self.characters = load_mapped_decomposition(
+                    decomp_filepath, self.compiled_path
+                )
+            except OSError as err:
+                logger.warning("Using the dict store, mmap is unavailable: %s", err)
+                self.store = "dict"
+
+        if self.store == "dict":
+            self.characters = {}
+            with open(decomp_filepath, encoding="utf-8") as decomp_file:
+                lines = decomp_file.readlines()
+
+                for line in lines:
+                    (
+                        character,
+                        decomposition_type,
+                        components,
+                    ) = parse_decomposition_line(line)
+                    self.characters[character] = {
+                        "decomposition_type": decomposition_type,
+                        "components": components,
+                    }
+        elif self.store != "mmap":
+            raise ValueError("Unknown decomposition store {}".format(self.store))
 
         # Reading in radical list
         radical_filepath = "{}/data/radical_with_meanings.json".format(CURRENT_DIR)
         with open(radical_filepath, encoding="utf-8") as radicals_file:
             self.radicals = json.load(radicals_file)
 
+        self.radicals_by_meaning = {}
+        for radical, meaning in self.radicals.items():
+            self.radicals_by_meaning.setdefault(meaning, []).append(radical)
+
     def compile_all_components(
         self,
     ):
@@ -58,6 +233,8 @@ class HanziDecomposer:
         with open(filepath, encoding="utf-8") as freq_file:
             csvreader = csv.reader(freq_file)
             next(csvreader, None)  # skip the headers
+            characters_with_component = {}
+            noglyph = self.noglyph
 
             for row in csvreader:
                 character = row[1]
@@ -65,44 +242,26 @@ class HanziDecomposer:
                 decomposition = self.decompose(character)
 
                 for component in decomposition["once"]:
-                    if component not in self.characters_with_component:
-                        if component != self.noglyph:
-                            self.characters_with_component.setdefault(component, [])
-                            self.characters_with_component[component].append(character)
-
-                    elif component != self.noglyph:
-                        self.characters_with_component[component].append(character)
-
+                    if component != noglyph:
+                        characters_with_component.setdefault(component, []).append(
+                            character
+                        )
+
+                # Radical components only list the first, most frequent,
+                # character they are found in, unless a once component
+                # already listed them.
                 for component in decomposition["radical"]:
-                    if component not in self.characters_with_component:
-                        if component != self.noglyph and not re.search(
-                            RADICAL_REGEX, component
-                        ):
-                            self.characters_with_component.setdefault(
-                                component,
-                                [],
-                            )
-                            if self.is_unique(
-                                self.characters_with_component[component],
-                                character,
-                            ):  # noqa
-                                self.characters_with_component[component].append(
-                                    character
-                                )  # noqa
-
-                        elif component != self.noglyph and not re.search(
-                            RADICAL_REGEX, component
-                        ):
-                            if self.is_unique(
-                                self.characters_with_component[component],
-                                character,
-                            ):  # noqa
-                                self.characters_with_component[component].append(
-                                    character
-                                )  # noqa
-
-        logging.info("Done compiling {} characters".format(int(line_num) - 1))
-        return self.characters_with_component
+                    if (
+                        component not in characters_with_component
+                        and component != noglyph
+                        and not RADICAL_REGEX.search(component)
+                    ):
+                        characters_with_component[component] = [character]
+
+        logger.info("Done compiling %d characters", int(line_num) - 1)
+        self._characters_with_component = characters_with_component
+        self.radical_group_characters = {}
+        return characters_with_component
 
     def is_unique(self, array_list, token):
         unique = True
@@ -116,7 +275,7 @@ class HanziDecomposer:
     def decompose_many(self, characterstring, decomposition_type=None):
         characterstring = str(characterstring)
         # Not Hanzi
-        if not re.search(u"[\u4e00-\u9fff]", characterstring):
+        if not HANZI_REGEX.search(characterstring):
             raise NotAHanziCharacter(characterstring)
 
         decomposed_components = {}
@@ -126,19 +285,39 @@ class HanziDecomposer:
         if not characterstring:
             raise "Invalid input"
 
-        for idx, char in enumerate(characterstring):
-            one_character = characterstring[idx : idx + 1]
-
-            # don't decompose the same character more than once
-            if one_character in decomposed_components.keys():
-                continue
-
+        # don't decompose the same character more than once
+        for one_character in dict.fromkeys(characterstring):
             decomposed_components[one_character] = self.decompose(
                 one_character, decomposition_type
             )
 
         return decomposed_components
 
+    def iter_decompose(self, texts, decomposition_type=None, chunk_size=1 << 16):
+        """
+        Streaming decompose_many: yields (character, decomposition) pairs
+        for every character of texts found in the decomposition data,
+        the first time it occurs in the whole stream.
+
+        texts: an iterable of strings, or a file-like object,
+        read chunk_size characters at a time.
+
+        Memory stays bounded whatever the input size, the only state kept
+        is the set of characters already seen, at most the size of the
+        decomposition data.
+        """
+        if hasattr(texts, "read"):
+            texts = iter_file_chunks(texts, chunk_size)
+
+        seen = set()
+        for text in texts:
+            for character in dict.fromkeys(text):
+                if character in seen or not self.component_exists(character):
+                    continue
+
+                seen.add(character)
+                yield character, self.decompose(character, decomposition_type)
+
     def decompose(self, character, decomposition_type=None):
         """
         Type of decomp:
@@ -147,8 +326,9 @@ class HanziDecomposer:
         3 = Graphical
         """
         character = character.replace(r"/\s/g", "")
-        if self.is_messy(character):
-            logging.error(self.is_messy(character))
+        messy = self.is_messy(character)
+        if messy:
+            logger.error(messy)
             return "Invalid Input"
 
         decomposed_char = {}
@@ -180,10 +360,9 @@ class HanziDecomposer:
         else:
             return
 
-        string = json.dumps(decomposed_char)
-        jsonoutput = json.loads(string)
-
-        return jsonoutput
+        # Every list in decomposed_char is a new one,
+        # the result can be handed out without copying it.
+        return decomposed_char
 
     # Functions to help with Decomposition
     def once_decomposition(self, character):
@@ -191,6 +370,9 @@ class HanziDecomposer:
         return self.replace_numbers(components)
 
     def radical_decomposition(self, character):
+        return list(self.radical_components(character))
+
+    def compute_radical_components(self, character):
         final_array = []
         if self.is_radical(character):
             final_array.append(character)
@@ -199,27 +381,30 @@ class HanziDecomposer:
 
             if len(components) == 2:
                 for j in range(2):
-                    final_array.extend(self.radical_decomposition(components[j]))
+                    final_array.extend(self.radical_components(components[j]))
             else:
                 final_array.append(character)
 
-        return self.replace_numbers(final_array)
+        return tuple(self.replace_numbers(final_array))
 
     def graphical_decomposition(self, character):
+        return list(self.graphical_components(character))
+
+    def compute_graphical_components(self, character):
         final_array = []
 
         components = self.get_components(character)
         if len(components) == 2:
             for j in range(2):
-                final_array.extend(self.graphical_decomposition(components[j]))
+                final_array.extend(self.graphical_components(components[j]))
 
         else:
             if not character.isdigit():
                 final_array.append(character)
             else:
-                final_array.extend(self.resolve_number(character))
+                final_array.extend(self.number_components(character))
 
-        return final_array
+        return tuple(final_array)
 
     def replace_numbers(self, characters):
         finalreview = []
@@ -234,6 +419,9 @@ class HanziDecomposer:
         return finalreview
 
     def resolve_number(self, number):
+        return list(self.number_components(number))
+
+    def compute_number_components(self, number):
         numbers_cleared = []
         components = self.get_components(number)
 
@@ -241,36 +429,78 @@ class HanziDecomposer:
             if not component.isdigit():
                 numbers_cleared.append(component)
             else:
-                numbers_cleared.extend(self.resolve_number(component))
+                numbers_cleared.extend(self.number_components(component))
+
+        return tuple(numbers_cleared)
+
+    def memo_info(self):
+        """Hits, misses and sizes of the decomposition memos."""
+        memo_info = {}
+
+        for name, memo in (
+            ("radical", self.radical_components),
+            ("graphical", self.graphical_components),
+            ("number", self.number_components),
+        ):
+            info = memo.cache_info()
+            memo_info[name] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+                "maxsize": info.maxsize,
+            }
 
-        return numbers_cleared
+        return memo_info
 
-    def get_characters_with_component(self, component):
-        if component in self.radicals.keys():
-            components = self.find_same_meaning_radicals(component)
-            characters = []
+    def stats(self):
+        """
+        Calls and cumulative times of the instrumented methods,
+        empty if instrumentation is off, and memo statistics.
+        """
+        memo_info = self.memo_info()
+        for info in memo_info.values():
+            lookups = info["hits"] + info["misses"]
+            info["hit_rate"] = info["hits"] / lookups if lookups else 0.0
+
+        return {
+            "methods": self.instrumentation.stats() if self.instrumentation else {},
+            "caches": memo_info,
+        }
+
+    def clear_memo(self):
+        self.radical_components.cache_clear()
+        self.graphical_components.cache_clear()
+        self.number_components.cache_clear()
+
+    def get_characters_with_component(self, component, immutable=False):
+        """
+        Characters containing component, or any radical with the same meaning
+        if component is a radical. None for an unknown component.
 
-            for component in components:
-                if self.characters_with_component[component]:
-                    characters.extend(self.characters_with_component[component])
+        immutable: return a tuple instead of a list. The characters of a radical
+        group are computed once and that same tuple is returned every time.
+        """
+        if component not in self.radicals:
+            characters = self.characters_with_component.get(component)
+            if characters is None:
+                return
 
-            return characters
-        else:
-            if component in self.characters_with_component.keys():
-                return self.characters_with_component[component]
+            return tuple(characters) if immutable else list(characters)
 
-            return
+        meaning = self.radicals[component]
+        characters = self.radical_group_characters.get(meaning)
 
-    def find_same_meaning_radicals(self, radical):
-        same_radicals = []
-        meaning = self.radicals[radical]
+        if characters is None:
+            characters = []
+            for radical in self.radicals_by_meaning[meaning]:
+                characters.extend(self.characters_with_component.get(radical, ()))
 
-        for radical in self.radicals:
-            if radical in self.radicals:
-                if self.radicals[radical] == meaning:
-                    same_radicals.append(radical)
+            characters = self.radical_group_characters[meaning] = tuple(characters)
 
-        return same_radicals
+        return characters if immutable else list(characters)
+
+    def find_same_meaning_radicals(self, radical):
+        return list(self.radicals_by_meaning[self.radicals[radical]])
 
     def is_radical(self, character):
         is_rad = False
@@ -281,12 +511,15 @@ class HanziDecomposer:
         return is_rad
 
     def get_components(self, character):
+        if self.store == "mmap":
+            return self.characters.get_components(character)
+
         if self.component_exists(character):
 
             if self.characters[character]["decomposition_type"] == "c":
                 return character
             else:
-                return self.characters[character]["components"]
+                return list(self.characters[character]["components"])
 
         else:
             return character
@@ -310,7 +543,8 @@ class HanziDecomposer:
 
 
 if __name__ == "__main__":
-    logging.info("Compiling Hanzi characters data...")
+    logging.basicConfig(level=logging.DEBUG)
+    logger.info("Compiling Hanzi characters data...")
 
     # Compile Components into an object array for easy lookup
     hanzi = HanziDecomposer()
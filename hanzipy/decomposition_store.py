@@ -0,0 +1,315 @@
+# coding:utf-8
+"""
+Compact binary copy of cjk_decomp.txt, memory mapped so that every process
+using it shares the same physical pages.
+
+Every distinct string (characters, components and decomposition types)
+is interned once. Characters are found through an open addressing hash table,
+components are stored as arrays of string ids.
+All sections are native uint32 words, followed by the UTF-8 string blob.
+"""
+import logging
+import mmap
+import os
+import tempfile
+import zlib
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+
+from hanzipy.snapshot import file_checksum
+
+MAGIC = 0x435A4448
+FORMAT_VERSION = 1
+BYTEORDER_MARK = 0x01020304
+NO_ENTRY = 0xFFFFFFFF
+HEADER_WORDS = 13
+
+logger = logging.getLogger(__name__)
+
+
+def parse_decomposition_line(line):
+    colonsplit = line.split(":")
+    character = colonsplit[0]
+    decomposition = colonsplit[1]
+    openbracket = decomposition.index("(")
+    closebracket = decomposition.index(")")
+    decomposition_type = decomposition[0:openbracket]
+    components = decomposition[openbracket + 1 : closebracket].split(",")
+
+    return character, decomposition_type, components
+
+
+def compile_decomposition(source_path, compiled_path):
+    strings = {}
+    entries = []
+
+    def intern(string):
+        string_id = strings.get(string)
+        if string_id is None:
+            string_id = strings[string] = len(strings)
+
+        return string_id
+
+    with open(source_path, encoding="utf-8") as decomp_file:
+        for line in decomp_file:
+            character, decomposition_type, components = parse_decomposition_line(
+                line
+            )
+            entries.append(
+                (
+                    intern(character),
+                    intern(decomposition_type),
+                    [intern(component) for component in components],
+                )
+            )
+
+    string_count = len(strings)
+    types = array("I", [NO_ENTRY]) * string_count
+    entry_components = [()] * string_count
+    # later lines override earlier ones, like the dict based store
+    for character_id, type_id, component_ids in entries:
+        types[character_id] = type_id
+        entry_components[character_id] = component_ids
+
+    components = array("I")
+    component_starts = array("I", [0])
+    for component_ids in entry_components:
+        components.extend(component_ids)
+        component_starts.append(len(components))
+
+    blob = bytearray()
+    offsets = array("I", [0])
+    encoded = []
+    for string in strings:
+        encoded_string = string.encode("utf-8")
+        encoded.append(encoded_string)
+        blob += encoded_string
+        offsets.append(len(blob))
+    blob += b"\0" * (-len(blob) % 4)
+
+    table_size = 1
+    while table_size < string_count * 2:
+        table_size *= 2
+    table = array("I", [0]) * table_size
+    for string_id, encoded_string in enumerate(encoded):
+        slot = zlib.crc32(encoded_string) & (table_size - 1)
+        while table[slot]:
+            slot = (slot + 1) & (table_size - 1)
+        table[slot] = string_id + 1
+
+    header = array(
+        "I",
+        [
+            MAGIC,
+            FORMAT_VERSION,
+            BYTEORDER_MARK,
+            string_count,
+            sum(1 for type_id in types if type_id != NO_ENTRY),
+            table_size,
+            len(components),
+            len(blob),
+        ],
+    )
+    header.frombytes(bytes.fromhex(file_checksum(source_path)))
+
+    compiled_path = Path(compiled_path)
+    tmp_path = compiled_path.with_name(
+        "{}.{}.tmp".format(compiled_path.name, os.getpid())
+    )
+    try:
+        compiled_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as compiled_file:
+            for section in (header, offsets, types, component_starts, components, table):
+                section.tofile(compiled_file)
+            compiled_file.write(blob)
+        os.replace(tmp_path, compiled_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    logger.debug("Compiled %d decompositions to %s", len(entries), compiled_path)
+
+
+class MappedDecomposition(Mapping):
+    """
+    Read-only mapping of character -> {"decomposition_type", "components"},
+    backed by a file written by compile_decomposition.
+    get_components and __contains__ read the file without creating
+    any per-character dict.
+    """
+
+    def __init__(self, compiled_path):
+        with open(compiled_path, "rb") as compiled_file:
+            self.mm = mmap.mmap(compiled_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.mm) % 4 or len(self.mm) < HEADER_WORDS * 4:
+            self.mm.close()
+            raise ValueError("{} is not a compiled decomposition".format(compiled_path))
+
+        self.words = memoryview(self.mm).cast("I")
+        header = self.words[:HEADER_WORDS]
+        if (
+            header[0] != MAGIC
+            or header[1] != FORMAT_VERSION
+            or header[2] != BYTEORDER_MARK
+        ):
+            header.release()
+            self.close()
+            raise ValueError("{} is not a compiled decomposition".format(compiled_path))
+
+        (
+            self.string_count,
+            self.key_count,
+            self.table_size,
+            components_count,
+            blob_size,
+        ) = header[3:8]
+        self.checksum = header[8:HEADER_WORDS].tobytes().hex()
+        header.release()
+
+        section_words = 3 * self.string_count + 2 + components_count + self.table_size
+        if len(self.mm) != (HEADER_WORDS + section_words) * 4 + blob_size:
+            self.close()
+            raise ValueError("{} is truncated".format(compiled_path))
+
+        start = HEADER_WORDS
+        sections = {}
+        for name, size in (
+            ("offsets", self.string_count + 1),
+            ("types", self.string_count),
+            ("component_starts", self.string_count + 1),
+            ("components", components_count),
+            ("table", self.table_size),
+        ):
+            sections[name] = self.words[start : start + size]
+            start += size
+
+        self.offsets = sections["offsets"]
+        self.types = sections["types"]
+        self.component_starts = sections["component_starts"]
+        self.components = sections["components"]
+        self.table = sections["table"]
+        self.blob_start = start * 4
+        self.compound_type_id = self.string_id("c")
+
+    def close(self):
+        for view in ("offsets", "types", "component_starts", "components", "table"):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self.words.release()
+        self.mm.close()
+
+    def string(self, string_id):
+        start = self.blob_start + self.offsets[string_id]
+        end = self.blob_start + self.offsets[string_id + 1]
+        return self.mm[start:end].decode("utf-8")
+
+    def string_id(self, string):
+        encoded_string = string.encode("utf-8")
+        mask = self.table_size - 1
+        slot = zlib.crc32(encoded_string) & mask
+
+        while True:
+            entry = self.table[slot]
+            if not entry:
+                return
+
+            string_id = entry - 1
+            start = self.blob_start + self.offsets[string_id]
+            end = self.blob_start + self.offsets[string_id + 1]
+            if self.mm[start:end] == encoded_string:
+                return string_id
+
+            slot = (slot + 1) & mask
+
+    def entry_id(self, character):
+        string_id = self.string_id(character)
+        if string_id is None or self.types[string_id] == NO_ENTRY:
+            return
+
+        return string_id
+
+    def get_components(self, character):
+        """Same semantics as HanziDecomposer.get_components."""
+        string_id = self.entry_id(character)
+        if string_id is None or self.types[string_id] == self.compound_type_id:
+            return character
+
+        return [
+            self.string(component_id)
+            for component_id in self.components[
+                self.component_starts[string_id] : self.component_starts[string_id + 1]
+            ]
+        ]
+
+    def __contains__(self, character):
+        return isinstance(character, str) and self.entry_id(character) is not None
+
+    def __getitem__(self, character):
+        string_id = self.entry_id(character) if isinstance(character, str) else None
+        if string_id is None:
+            raise KeyError(character)
+
+        return {
+            "decomposition_type": self.string(self.types[string_id]),
+            "components": [
+                self.string(component_id)
+                for component_id in self.components[
+                    self.component_starts[string_id] : self.component_starts[
+                        string_id + 1
+                    ]
+                ]
+            ],
+        }
+
+    def __iter__(self):
+        for string_id in range(self.string_count):
+            if self.types[string_id] != NO_ENTRY:
+                yield self.string(string_id)
+
+    def __len__(self):
+        return self.key_count
+
+
+def fallback_compiled_path(compiled_path):
+    """Where compiled_path is compiled when its own directory is not writable."""
+    return Path(tempfile.gettempdir()) / "hanzipy" / Path(compiled_path).name
+
+
+def load_mapped_decomposition(source_path, compiled_path):
+    """
+    Maps compiled_path, compiling source_path first
+    if the compiled file is missing, unreadable or outdated.
+
+    When compiled_path can't be written, as in a read-only install,
+    the data is compiled to fallback_compiled_path instead.
+    Raises OSError if neither can be written.
+    """
+    candidates = [Path(compiled_path), fallback_compiled_path(compiled_path)]
+    checksum = file_checksum(source_path)
+
+    for candidate in candidates:
+        try:
+            store = MappedDecomposition(candidate)
+            if store.checksum == checksum:
+                return store
+
+            store.close()
+        except (OSError, ValueError) as err:
+            logger.debug("Compiled decomposition unavailable: %s", err)
+
+    for candidate in candidates:
+        try:
+            compile_decomposition(source_path, candidate)
+        except OSError as err:
+            logger.warning("Could not compile decomposition to %s: %s", candidate, err)
+            compile_error = err
+            continue
+
+        return MappedDecomposition(candidate)
+
+    raise compile_error
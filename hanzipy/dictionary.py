@@ -1,132 +1,287 @@
 import logging
 import re
+from array import array
 from math import sqrt
 from pathlib import Path
 
-from hanzipy.decomposer import HanziDecomposer
+from hanzipy.cache import CachedMethod
+from hanzipy.ccedict import CCEDICT_STARTING_LINE, load_ccedict
+from hanzipy.dataset import FrozenDataset
 from hanzipy.exceptions import NotAHanziCharacter
+from hanzipy.frequency import CharacterFrequency
+from hanzipy.instrumentation import get_instrumentation
+from hanzipy.pinyin import PINYIN_TABLE, PinyinSyllable  # noqa
+from hanzipy.registry import get_decomposer
+from hanzipy.segmenter import HanziSegmenter
+from hanzipy.snapshot import SNAPSHOT_DIR, load_snapshot, write_snapshot
+from hanzipy.trie import WordTrie
 
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
 CURRENT_DIR = BASE_DIR = Path(__file__).parent
-CCEDICT_STARTING_LINE = 30
+DICTIONARY_SNAPSHOT = SNAPSHOT_DIR / "dictionary.snapshot"
+DICTIONARY_SOURCES = [
+    "{}/data/cedict_ts.u8".format(CURRENT_DIR),
+    "{}/data/leiden_freq_data.txt".format(CURRENT_DIR),
+    "{}/data/leiden_freq_variants_removed.txt".format(CURRENT_DIR),
+]
+# Attributes persisted in the dictionary snapshot
+SNAPSHOT_ATTRIBUTES = [
+    "dictionary_simplified",
+    "dictionary_traditional",
+    "char_freq",
+    "character_frequency_count_index",
+    "word_freq",
+    "simplified_words",
+    "simplified_index",
+    "traditional_words",
+    "traditional_index",
+    "word_trie",
+]
+# Attributes shared by the views of a frozen dictionary dataset
+DATASET_ATTRIBUTES = SNAPSHOT_ATTRIBUTES + ["irregular_phonetics"]
+
+
+def copy_entries(entries):
+    return [dict(entry) for entry in entries]
+
+
+def copy_examples(examples):
+    return {tier: copy_entries(words) for tier, words in examples.items()}
+
+
+def copy_regularities(regularities):
+    return {
+        pinyin: {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in regularity.items()
+        }
+        for pinyin, regularity in regularities.items()
+    }
+
+
+# Methods whose results can be cached, with the copy applied to cached results
+CACHED_METHODS = {
+    "definition_lookup": copy_entries,
+    "dictionary_search": copy_entries,
+    "get_examples": copy_examples,
+    "determine_phonetic_regularity": copy_regularities,
+}
+# Methods timed when instrumentation is on
+INSTRUMENTED_METHODS = [
+    "compute_dictionary",
+    "load_snapshot",
+    "load_frequency_data",
+    "build_search_index",
+    "build_word_trie",
+    "definition_lookup",
+    "dictionary_search",
+    "index_search",
+    "regex_search",
+    "get_examples",
+    "compute_examples",
+    "get_pinyin",
+    "determine_phonetic_regularity",
+    "determine_phonetic_regularities",
+    "segment",
+]
 
 
-class PinyinSyllable:
-    def __init__(self, raw_syllable):
-        self.raw_syllable = raw_syllable
+class HanziDictionary:
+    def __init__(
+        self,
+        use_snapshot=True,
+        snapshot_path=None,
+        lazy_examples=True,
+        decomposer=None,
+        dataset=None,
+        caches=None,
+        instrumentation=None,
+    ):
+        """
+        use_snapshot: load the parsed data from a binary snapshot
+        instead of parsing CC-CEDICT and the Leiden frequency files.
+        The snapshot is (re)built whenever it is missing or the sources changed.
 
-    def syllable(self):
-        return self.raw_syllable[: len(self.raw_syllable) - 1]
+        snapshot_path: where the snapshot lives,
+        defaults to DICTIONARY_SNAPSHOT.
 
-    def initial(self):
-        initial = ""
-        if self.raw_syllable[1:2] == "h":
-            # Take into zh, ch, sh
-            initial = self.raw_syllable[0:2]
-        else:
-            initial = self.raw_syllable[0:1]
+        lazy_examples: compute and cache the example tiers of a character
+        on its first get_examples call, instead of for every character
+        in the constructor.
 
-        return initial
+        decomposer: HanziDecomposer used when determine_phonetic_regularity
+        is given a character, defaults to the process-wide shared one.
 
-    def final(self):
-        syllable = self.syllable()
-        rhyme = syllable.replace(self.initial(), "")
-        return rhyme
+        dataset: FrozenDataset returned by freeze(). The dictionary is then
+        a view over its data, nothing is loaded nor copied.
 
+        caches: method name -> cache (see hanzipy.cache) of its results,
+        for any of CACHED_METHODS.
 
-class HanziDictionary:
-    def __init__(self):
+        instrumentation: True, or a hanzipy.instrumentation.Instrumentation,
+        to count and time the calls of INSTRUMENTED_METHODS, loading included.
+        Off by default, at no cost.
+        """
         self.dictionary_simplified = {}
         self.dictionary_traditional = {}
         self.irregular_phonetics = {}
-        self.char_freq = {}
+        # Character frequency columns, items are built on access
+        self.char_freq = CharacterFrequency()
         self.character_frequency_count_index = []
+        # Word -> Leiden corpus count
         self.word_freq = {}
+        # Character posting lists: character -> ids of the words containing it
+        self.simplified_words = []
+        self.simplified_index = {}
+        self.traditional_words = []
+        self.traditional_index = {}
+        # Simplified and traditional words, for prefix and longest match lookups
+        self.word_trie = WordTrie()
+        # Example word tiers of each character, filled by get_examples
+        self.examples = {}
         self.last_search_query = ""
-        self.compute_dictionary()
+        self.snapshot_path = snapshot_path or DICTIONARY_SNAPSHOT
+        self._decomposer = decomposer
+        self._segmenter = None
+
+        self.caches = caches or {}
+        for method_name, cache in self.caches.items():
+            if method_name not in CACHED_METHODS:
+                raise ValueError("{} results can't be cached".format(method_name))
+
+            setattr(
+                self,
+                method_name,
+                CachedMethod(
+                    getattr(self, method_name), cache, CACHED_METHODS[method_name]
+                ),
+            )
+
+        # wraps the cached methods too, so that cache hits are counted
+        self.instrumentation = get_instrumentation(instrumentation)
+        if self.instrumentation is not None:
+            self.instrumentation.instrument(self, INSTRUMENTED_METHODS)
+
+        if dataset is not None:
+            self.use_dataset(dataset)
+        elif not use_snapshot:
+            self.compute_dictionary()
+        elif not self.load_snapshot():
+            self.compute_dictionary()
+            self.save_snapshot()
+
+        if not lazy_examples:
+            self.precompute_examples()
+
+    def stats(self):
+        """
+        Calls and cumulative times of the instrumented methods,
+        empty if instrumentation is off, and cache statistics.
+        """
+        return {
+            "methods": self.instrumentation.stats() if self.instrumentation else {},
+            "caches": dict(
+                self.cache_stats(), examples={"size": len(self.examples)}
+            ),
+        }
+
+    def cache_stats(self):
+        """Hits, misses and evictions of the result cache of each method."""
+        return {method_name: cache.stats() for method_name, cache in self.caches.items()}
+
+    @property
+    def decomposer(self):
+        if self._decomposer is None:
+            self._decomposer = get_decomposer()
+
+        return self._decomposer
+
+    @property
+    def segmenter(self):
+        if self._segmenter is None:
+            self._segmenter = HanziSegmenter(self)
+
+        return self._segmenter
+
+    def freeze(self, examples=False):
+        """
+        Read-only dataset of this dictionary, to share between threads
+        with HanziDictionary(dataset=...).
+
+        examples: compute the example tiers of every character first,
+        so that they are part of the dataset.
+        """
+        if examples:
+            self.precompute_examples()
+
+        return FrozenDataset(
+            examples=dict(self.examples),
+            segmenter=self.segmenter,
+            **{attribute: getattr(self, attribute) for attribute in DATASET_ATTRIBUTES},
+        )
+
+    def use_dataset(self, dataset):
+        for attribute in DATASET_ATTRIBUTES:
+            setattr(self, attribute, getattr(dataset, attribute))
+
+        # the view's own caches, seeded from the dataset
+        self.examples = dict(dataset.examples)
+        self._segmenter = dataset.segmenter
+
+    def load_snapshot(self):
+        payload = load_snapshot(self.snapshot_path, DICTIONARY_SOURCES)
+        if payload is None:
+            return False
+
+        for attribute in SNAPSHOT_ATTRIBUTES:
+            setattr(self, attribute, payload[attribute])
+
+        logger.debug("Dictionary loaded from %s", self.snapshot_path)
+        return True
+
+    def save_snapshot(self):
+        payload = {
+            attribute: getattr(self, attribute) for attribute in SNAPSHOT_ATTRIBUTES
+        }
+        return write_snapshot(self.snapshot_path, payload, DICTIONARY_SOURCES)
 
     def compute_dictionary(self):
-        logging.debug("Compiling hanzi characters dictionary...")
+        logger.debug("Compiling hanzi characters dictionary...")
 
         ccedict_filepath = "{}/data/cedict_ts.u8".format(CURRENT_DIR)
 
         with open(ccedict_filepath, encoding="utf-8") as ccedict_file:
-            lines = ccedict_file.readlines()
             self.load_frequency_data()
+            self.dictionary_simplified, self.dictionary_traditional = load_ccedict(
+                ccedict_file, CCEDICT_STARTING_LINE
+            )
 
-            def next_traditional_char(idx):
-                if idx < len(lines):
-                    nextcharacter = lines[idx].split(" ")
-                    nextcheck = nextcharacter[0]
-                    return nextcheck
-
-                return ""
-
-            def next_simplified_char(idx):
-                if idx < len(lines):
-                    nextcharacter = lines[idx].split(" ")
-                    nextcheck = nextcharacter[1]
-                    return nextcheck
-
-                return ""
-
-            def get_elements(line):
-                openbracket = line.index("[")
-                closebracket = line.index("]")
-                defStart = line.index("/")
-                defClose = line.rindex("/")
-                pinyin = line[openbracket + 1 : closebracket]
-                definition = line[defStart + 1 : defClose]
-                elements = line.split(" ")
-                traditional = elements[0]
-                simplified = elements[1]
-
-                element = {
-                    "traditional": traditional,
-                    "simplified": simplified,
-                    "pinyin": pinyin,
-                    "definition": definition,
-                }
-
-                return element
-
-            for idx, line in enumerate(lines[CCEDICT_STARTING_LINE:]):
-                hanzi_dict = [get_elements(line)]
-
-                while hanzi_dict[0]["traditional"] == next_traditional_char(
-                    idx + 1
-                ) and hanzi_dict[0]["simplified"] == next_simplified_char(idx + 1):
-                    hanzi_dict.append(get_elements(idx + 1))
-                    idx += 1
-
-                simplified = self.dictionary_simplified.get(hanzi_dict[0]["simplified"])
-                traditional = self.dictionary_traditional.get(
-                    hanzi_dict[0]["traditional"]
-                )
+        self.build_search_index()
+        self.build_word_trie()
 
-                if simplified:
-                    newhanzi_dict = simplified
-                    for element in hanzi_dict:
-                        newhanzi_dict.append(element)
+    def build_search_index(self):
+        def index_words(dictionary):
+            words = list(dictionary.keys())
+            index = {}
 
-                    self.dictionary_simplified[
-                        hanzi_dict[0]["simplified"]
-                    ] = newhanzi_dict
-                elif traditional:
-                    newhanzi_dict = traditional
+            for word_id, word in enumerate(words):
+                for char in set(word):
+                    index.setdefault(char, array("I")).append(word_id)
 
-                    for element in hanzi_dict:
-                        newhanzi_dict.append(element)
+            return words, index
 
-                    self.dictionary_traditional[
-                        hanzi_dict[0]["traditional"]
-                    ] = newhanzi_dict
-                else:
-                    self.dictionary_simplified[hanzi_dict[0]["simplified"]] = hanzi_dict
-                    self.dictionary_traditional[
-                        hanzi_dict[0]["traditional"]
-                    ] = hanzi_dict
+        self.simplified_words, self.simplified_index = index_words(
+            self.dictionary_simplified
+        )
+        self.traditional_words, self.traditional_index = index_words(
+            self.dictionary_traditional
+        )
+
+    def build_word_trie(self):
+        self.word_trie = WordTrie(
+            list(self.dictionary_simplified) + list(self.dictionary_traditional)
+        )
 
     def definition_lookup(self, word, script_type=None):
         # Not Hanzi
@@ -136,16 +291,16 @@ class HanziDictionary:
         try:
             if not script_type:
                 if self.determine_if_simplfied_char(word):
-                    return self.dictionary_simplified[word]
+                    return copy_entries(self.dictionary_simplified[word])
 
                 if not self.determine_if_simplfied_char(word):
-                    return self.dictionary_traditional[word]
+                    return copy_entries(self.dictionary_traditional[word])
 
             else:
                 if script_type == "simplified":
-                    return self.dictionary_simplified[word]
+                    return copy_entries(self.dictionary_simplified[word])
                 elif script_type == "traditional":
-                    return self.dictionary_traditional[word]
+                    return copy_entries(self.dictionary_traditional[word])
         except KeyError:
             raise KeyError(f"{word} not available in {script_type} dictionary.")
 
@@ -160,7 +315,6 @@ class HanziDictionary:
         """
 
         search_result = []
-        regexstring = "^("
 
         # do not use expensive regex and for loops
         # if only one character searched
@@ -171,33 +325,114 @@ class HanziDictionary:
             # then try and look for traditional entries.
             if len(search_result) == 0:
                 search_result.extend(self.dictionary_traditional.get(character, []))
+
+        # Characters with a regex meaning can't be answered by the index
+        elif not character or re.escape(character) != character:
+            search_result = self.regex_search(character, character_type)
+
         else:
-            if character_type == "only":
-                for idx, char in enumerate(character):
-                    if idx < len(character) - 1:
-                        regexstring = regexstring + character[idx : idx + 1] + "|"
-                    else:
-                        regexstring = regexstring + character[idx : idx + 1] + ")+$"
-            else:
-                regexstring = "[" + character + "]"
+            search_result = self.index_search(character, character_type)
 
-            # First check for simplified.
-            for word in self.dictionary_simplified.keys():
-                if re.search(regexstring, word):
-                    search_result.extend(self.dictionary_simplified[word])
+        # the entries of the dictionary must not be altered by the caller
+        return copy_entries(search_result)
+
+    def index_search(self, character, character_type=None):
+        """
+        Same results as regex_search, using the character posting lists
+        instead of matching every word of the dictionary.
+        """
+        search_result = []
+        characters = set(character)
+
+        for words, index, dictionary in (
+            (self.simplified_words, self.simplified_index, self.dictionary_simplified),
+            (
+                self.traditional_words,
+                self.traditional_index,
+                self.dictionary_traditional,
+            ),
+        ):
+            # Words containing any of the characters
+            word_ids = set()
+            for char in characters:
+                word_ids.update(index.get(char, ()))
+
+            for word_id in sorted(word_ids):
+                word = words[word_id]
+
+                # Words made exclusively of the characters
+                if character_type == "only" and not characters.issuperset(word):
+                    continue
+
+                search_result.extend(dictionary[word])
 
             # If there's nothing to be found,
             # then try and look for traditional entries.
-            if len(search_result) == 0:
-                for word in self.dictionary_traditional.keys():
-                    if re.search(regexstring, word):
-                        search_result.extend(self.dictionary_traditional[word])
+            if search_result:
+                break
 
         return search_result
 
+    def regex_search(self, character, character_type=None):
+        search_result = []
+        regexstring = "^("
+
+        if character_type == "only":
+            for idx, char in enumerate(character):
+                if idx < len(character) - 1:
+                    regexstring = regexstring + character[idx : idx + 1] + "|"
+                else:
+                    regexstring = regexstring + character[idx : idx + 1] + ")+$"
+        else:
+            regexstring = "[" + character + "]"
+
+        # First check for simplified.
+        for word in self.dictionary_simplified.keys():
+            if re.search(regexstring, word):
+                search_result.extend(self.dictionary_simplified[word])
+
+        # If there's nothing to be found,
+        # then try and look for traditional entries.
+        if len(search_result) == 0:
+            for word in self.dictionary_traditional.keys():
+                if re.search(regexstring, word):
+                    search_result.extend(self.dictionary_traditional[word])
+
+        return search_result
+
+    def segment(self, phrase):
+        """Splits phrase in its most likely dictionary words."""
+        return self.segmenter.segment(phrase)
+
+    def iter_segment(self, texts, chunk_size=1 << 16):
+        return self.segmenter.iter_segment(texts, chunk_size)
+
     def get_examples(self, character):
         """Does a dictionary search and finds the most useful example words"""
+        examples = self.examples.get(character)
+        if examples is None:
+            examples = self.compute_examples(character)
+            # only dictionary characters, so that the cache stays bounded
+            if character in self.simplified_index or character in self.traditional_index:
+                self.examples[character] = examples
+
+        # the cached tiers must not be altered by the caller
+        return copy_examples(examples)
+
+    def precompute_examples(self, characters=None):
+        """
+        Computes the example tiers of characters, by default every character
+        of the dictionary, so that get_examples is a lookup from then on.
+        """
+        if characters is None:
+            characters = dict.fromkeys(self.simplified_index)
+            characters.update(dict.fromkeys(self.traditional_index))
+
+        for character in characters:
+            if character not in self.examples:
+                self.examples[character] = self.compute_examples(character)
 
+    def compute_examples(self, character):
         potiental_examples = self.dictionary_search(character)
         all_frequencies = []
         search_result = {
@@ -209,80 +444,44 @@ class HanziDictionary:
         for potential_example in potiental_examples:
             # Create Array of Frequency Points to calculate distributions
             # It takes the frequency accounts of both scripts into account.
-
-            word_simplified = potential_example["simplified"]
-            word_traditional = potential_example["traditional"]
-
-            total_frequency = 0
-
-            if self.word_freq.get(word_simplified):
-                total_frequency += int(self.word_freq[word_simplified])
-
-            if self.word_freq.get(word_traditional):
-                total_frequency += int(self.word_freq[word_traditional])
-
-            all_frequencies.append(total_frequency)
+            all_frequencies.append(
+                self.word_freq.get(potential_example["simplified"], 0)
+                + self.word_freq.get(potential_example["traditional"], 0)
+            )
 
         # Calculate mean, variance + sd
+        # (summed in the same order as always, to keep the exact same floats)
         all_frequencies.sort(reverse=True)
+        mean = sum(all_frequencies) / len(all_frequencies)
 
-        def compute_mean():
-            total = 0
-
-            for freq in all_frequencies:
-                total += int(freq)
-
-            mean = total / len(all_frequencies)
-            return mean
-
-        def compute_variance():
-            total = 0
-
-            for freq in all_frequencies:
-                temp = int(freq) - mean
-                total += temp * temp
-
-            variance = total / len(all_frequencies)
-            return variance
+        total = 0
+        for frequency in all_frequencies:
+            temp = frequency - mean
+            total += temp * temp
 
-        mean = compute_mean()
-        variance = compute_variance()
+        variance = total / len(all_frequencies)
         sd = sqrt(variance)
 
         # Create frequency categories
-        def determine_freq_categories():
-            def append_frequency(word):
-                simplified_char_freq = self.word_freq.get(word["simplified"])
-
-                if simplified_char_freq:
-                    simplified_char_freq = int(simplified_char_freq)
-                    if simplified_char_freq < low_range:
-                        search_result["low_frequency"].append(word)
-
-                    if (
-                        simplified_char_freq >= mid_range[1]
-                        and simplified_char_freq < mid_range[0]
-                    ):
-                        search_result["mid_frequency"].append(word)
-
-                    if simplified_char_freq >= high_range:
-                        search_result["high_frequency"].append(word)
-
-            if mean - sd < 0:
-                low_range = 0 + mean / 3
-            else:
-                low_range = mean - sd
+        if mean - sd < 0:
+            low_range = 0 + mean / 3
+        else:
+            low_range = mean - sd
+
+        high_range = mean + sd
 
-            mid_range = [mean + sd, low_range]
-            high_range = mean + sd
+        for word in potiental_examples:
+            simplified_char_freq = self.word_freq.get(word["simplified"])
 
-            for potential_example in potiental_examples:
-                word = potential_example
+            if simplified_char_freq is not None:
+                if simplified_char_freq < low_range:
+                    search_result["low_frequency"].append(word)
 
-                if self.word_freq.get(word["simplified"]):
-                    append_frequency(word)
+                if low_range <= simplified_char_freq < high_range:
+                    search_result["mid_frequency"].append(word)
 
-        determine_freq_categories()
+                if simplified_char_freq >= high_range:
+                    search_result["high_frequency"].append(word)
 
         return search_result
 
@@ -294,7 +493,11 @@ class HanziDictionary:
             return False
 
     def load_frequency_data(self):
-        logging.debug("Starting to read frequency data")
+        logger.debug("Starting to read frequency data")
+        # new containers, the current ones may be shared with a frozen dataset
+        self.word_freq = {}
+        self.char_freq = CharacterFrequency()
+        self.character_frequency_count_index = []
 
         leiden_freq = "{}/data/leiden_freq_data.txt".format(CURRENT_DIR)
         leiden_freq_no_variants = "{}/data/leiden_freq_variants_removed.txt".format(
@@ -309,7 +512,7 @@ class HanziDictionary:
                 splits = line.split(",")
                 word = splits[0]
                 freq = splits[1]
-                self.word_freq[word] = freq
+                self.word_freq[word] = int(freq)
 
         with open(leiden_freq_no_variants, encoding="utf-8") as leiden_freq_no_variants_file:
             lines = leiden_freq_no_variants_file.readlines()
@@ -320,21 +523,23 @@ class HanziDictionary:
                 number = int(splits[0])
                 character = splits[1]
 
-                self.char_freq[character] = {
-                    "number": number,
-                    "character": character,
-                    "count": splits[2],
-                    "percentage": splits[3],
-                    "pinyin": splits[4],
-                    "meaning": splits[5],
-                }
+                self.char_freq.add(
+                    number,
+                    character,
+                    int(splits[2]),
+                    float(splits[3]),
+                    splits[4],
+                    splits[5],
+                )
 
                 self.character_frequency_count_index.insert(number, character)
 
-            logging.debug("Frequency data loaded")
+            logger.debug("Frequency data loaded")
 
     def load_irregular_phonetics(self):
         irregular_phonetics = "{}/data/irregular_phonetics.txt".format(CURRENT_DIR)
+        # a new dict, the current one may be shared with a frozen dataset
+        self.irregular_phonetics = dict(self.irregular_phonetics)
 
         with open(irregular_phonetics, encoding="utf-8") as irregular_phonetics_file:
             lines = irregular_phonetics_file.readlines()
@@ -383,7 +588,7 @@ class HanziDictionary:
         # An object is not passed to this function,
         # create the decomposition object with the character inp:
         if not isinstance(decomposition, dict):
-            decomposition = HanziDecomposer().decompose(decomposition)
+            decomposition = self.decomposer.decompose(decomposition)
 
         # Get all possible pronunciations for character
         charpinyin = self.get_pinyin(decomposition["character"])
@@ -463,6 +668,82 @@ class HanziDictionary:
 
         return regularities
 
+    def determine_phonetic_regularities(self, decompositions):
+        """
+        Batch determine_phonetic_regularity over decomposition objects
+        or characters, returns {character: regularities}.
+
+        Pinyin are encoded as integers once, then every character/component
+        pinyin pair is scored by a lookup in the PinyinTable regularity matrix,
+        one pair at a time.
+        """
+        results = {}
+        charpinyin_codes = array("I")
+        phonetic_pinyin_codes = array("I")
+        pending_regularities = []
+        encode = PINYIN_TABLE.encode
+        # components are shared by many characters, look them up once
+        component_pinyins = {}
+
+        for decomposition in decompositions:
+            if not isinstance(decomposition, dict):
+                decomposition = self.decomposer.decompose(decomposition)
+
+            charpinyin = self.get_pinyin(decomposition["character"])
+            if not charpinyin:
+                results[decomposition["character"]] = None
+                continue
+
+            regularities = {}
+            # Level 1 decomposition components, then radical ones
+            for component in decomposition["once"] + decomposition["radical"]:
+                if component not in component_pinyins:
+                    component_pinyins[component] = self.get_pinyin(component)
+                phonetic_pinyin = component_pinyins[component]
+
+                for pinyin in charpinyin:
+                    regularity = regularities.setdefault(
+                        pinyin,
+                        {
+                            "character": decomposition["character"],
+                            "component": [],
+                            "phonetic_pinyin": [],
+                            "regularity": [],
+                        },
+                    )
+
+                    if not phonetic_pinyin:
+                        regularity["phonetic_pinyin"].append(None)
+                        regularity["component"].append(component)
+                        regularity["regularity"].append(None)
+                    else:
+                        for phon_pinyin in phonetic_pinyin:
+                            regularity["phonetic_pinyin"].append(phon_pinyin)
+                            regularity["component"].append(component)
+
+                            if not pinyin or not phon_pinyin:
+                                regularity["regularity"].append(None)
+                                continue
+
+                            # scored below, with every other pair
+                            pending_regularities.append(
+                                (
+                                    regularity["regularity"],
+                                    len(regularity["regularity"]),
+                                )
+                            )
+                            regularity["regularity"].append(None)
+                            charpinyin_codes.append(encode(pinyin))
+                            phonetic_pinyin_codes.append(encode(phon_pinyin))
+
+            results[decomposition["character"]] = regularities
+
+        scores = PINYIN_TABLE.regularities(charpinyin_codes, phonetic_pinyin_codes)
+        for (regularity, position), score in zip(pending_regularities, scores):
+            regularity[position] = score
+
+        return results
+
     def get_character_frequency(self, character):
         # Not Hanzi
         if not re.search("[\u4e00-\u9fff]", character):
@@ -472,27 +753,12 @@ class HanziDictionary:
 
         # Check if this character has a lookup
         if dict_entry and dict_entry[0]:
-            # Check if we can return a simplified version
-            if self.char_freq[dict_entry[0]["simplified"]]:
-                return self.char_freq[dict_entry[0]["simplified"]]
-
-            else:
-                # If not, then this is could be a traditional character
-                # that possibly exists in the frequency list
-                if self.char_freq[character]:
-                    return self.char_freq[character]
-                else:
-                    # If not, this is a very uncommon character
-                    raise "Character not found"
-
-            return self.char_freq[character]
+            # Return the simplified version, script agnostic
+            return self.char_freq[dict_entry[0]["simplified"]]
 
-        elif self.char_freq[character]:
-            # In the unlikely case that we don't have a dictionary entry
-            # but it exists in the frequency list
-            return self.char_freq[character]
-        else:
-            raise "Character not found"
+        # In the unlikely case that we don't have a dictionary entry
+        # but it exists in the frequency list
+        return self.char_freq[character]
 
     def get_character_in_frequency_list_by_position(self, position):
         return self.get_character_frequency(
@@ -504,37 +770,17 @@ class HanziDictionary:
         if not charpinyin or not phonetic_pinyin:
             return
 
-        regularity = 0
-        charpinyin = PinyinSyllable(charpinyin.lower())
-        phonetic_pinyin = PinyinSyllable(phonetic_pinyin.lower())
-
-        # Regularity Scale:
-        # 0 = No regularity
-        # 1 = Exact Match (with tone)
-        # 2 = Syllable Match (without tone)
-        # 3 = Similar in Initial
-        # 4 = Similar in Final
-
-        # First test for Scale 1 & 2
-        if charpinyin.syllable() == phonetic_pinyin.syllable():
-            regularity = 2
-            if charpinyin.raw_syllable == phonetic_pinyin.raw_syllable:
-                regularity = 1
-
-        # If still no regularity found,
-        # test for initial & final regularity (scale 3 & 4)
-        if regularity == 0:
-            if charpinyin.final() == phonetic_pinyin.final():
-                regularity = 4
-            else:
-                if charpinyin.initial() == phonetic_pinyin.initial():
-                    regularity = 3
-
-        return regularity
+        # Syllables are interned,
+        # their regularities computed once then read from a matrix
+        return PINYIN_TABLE.regularity(
+            PINYIN_TABLE.encode(charpinyin),
+            PINYIN_TABLE.encode(phonetic_pinyin),
+        )
 
 
 if __name__ == "__main__":
-    logging.info("Compiling Hanzi characters dictionary...")
+    logging.basicConfig(level=logging.DEBUG)
+    logger.info("Compiling Hanzi characters dictionary...")
 
     # Compile Components into an object array for easy lookup
     hanzi_dict = HanziDictionary()
@@ -0,0 +1,79 @@
+# coding:utf-8
+from array import array
+from collections.abc import Mapping
+
+
+class CharacterFrequency(Mapping):
+    """
+    Junda character frequency list stored as parallel numeric columns,
+    with a character -> row index.
+
+    Items are the same dicts as the frequency list used to hold,
+    "count" and "percentage" included as strings, but only built on access.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.characters = []
+        self.numbers = array("I")
+        self.counts = array("Q")
+        self.percentages = array("d")
+        self.pinyins = []
+        self.meanings = []
+
+    def add(self, number, character, count, percentage, pinyin, meaning):
+        row = self.rows.get(character)
+
+        if row is None:
+            self.rows[character] = len(self.characters)
+            self.characters.append(character)
+            self.numbers.append(number)
+            self.counts.append(count)
+            self.percentages.append(percentage)
+            self.pinyins.append(pinyin)
+            self.meanings.append(meaning)
+        else:
+            # a later line overrides the former one
+            self.numbers[row] = number
+            self.counts[row] = count
+            self.percentages[row] = percentage
+            self.pinyins[row] = pinyin
+            self.meanings[row] = meaning
+
+    def count(self, character):
+        return self.counts[self.rows[character]]
+
+    def percentage(self, character):
+        return self.percentages[self.rows[character]]
+
+    def most_frequent(self, characters, limit=None):
+        """Sorts characters by decreasing count, unknown characters last."""
+        rows = self.rows
+        counts = self.counts
+
+        def count(character):
+            row = rows.get(character)
+            return -1 if row is None else counts[row]
+
+        return sorted(characters, key=count, reverse=True)[:limit]
+
+    def __getitem__(self, character):
+        row = self.rows[character]
+
+        return {
+            "number": self.numbers[row],
+            "character": character,
+            "count": str(self.counts[row]),
+            "percentage": repr(self.percentages[row]),
+            "pinyin": self.pinyins[row],
+            "meaning": self.meanings[row],
+        }
+
+    def __contains__(self, character):
+        return character in self.rows
+
+    def __iter__(self):
+        return iter(self.characters)
+
+    def __len__(self):
+        return len(self.characters)
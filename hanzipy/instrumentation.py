@@ -0,0 +1,104 @@
+# coding:utf-8
+"""
+Opt-in call counters and timers for HanziDictionary and HanziDecomposer.
+
+Nothing is wrapped unless instrumentation is asked for,
+so that it costs nothing when it is off.
+"""
+import threading
+import time
+
+
+class Instrumentation:
+    """
+    Call count and cumulative time of each instrumented method.
+
+    Times are inclusive: the time of a method includes the time
+    of the instrumented methods it calls, recursive calls included.
+    callback, if given, is called with the method name and the elapsed
+    seconds after every call. One instance can be shared by several objects.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.lock = threading.Lock()
+        # method name -> [calls, total seconds]
+        self.counters = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["lock"]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def record(self, name, elapsed):
+        with self.lock:
+            counter = self.counters.get(name)
+            if counter is None:
+                counter = self.counters[name] = [0, 0.0]
+
+            counter[0] += 1
+            counter[1] += elapsed
+
+        if self.callback is not None:
+            self.callback(name, elapsed)
+
+    def instrument(self, instance, method_names):
+        """Replaces the methods of instance by timed ones."""
+        prefix = type(instance).__name__
+
+        for method_name in method_names:
+            setattr(
+                instance,
+                method_name,
+                TimedMethod(
+                    getattr(instance, method_name),
+                    "{}.{}".format(prefix, method_name),
+                    self,
+                ),
+            )
+
+    def stats(self):
+        with self.lock:
+            return {
+                name: {
+                    "calls": calls,
+                    "total_time": total_time,
+                    "mean_time": total_time / calls,
+                }
+                for name, (calls, total_time) in self.counters.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+
+
+class TimedMethod:
+    def __init__(self, method, name, instrumentation):
+        self.method = method
+        self.name = name
+        self.instrumentation = instrumentation
+        self.__name__ = getattr(method, "__name__", name)
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.method(*args, **kwargs)
+        finally:
+            self.instrumentation.record(self.name, time.perf_counter() - start)
+
+
+def get_instrumentation(instrumentation):
+    """Instrumentation for an instrumentation option: None, True or an instance."""
+    if instrumentation is None or instrumentation is False:
+        return
+
+    if instrumentation is True:
+        return Instrumentation()
+
+    return instrumentation
@@ -0,0 +1,154 @@
+# coding:utf-8
+import logging
+import os
+from collections import deque
+from multiprocessing import Pool
+
+from hanzipy.decomposer import COMPILED_DECOMPOSITION, CURRENT_DIR, HanziDecomposer
+from hanzipy.decomposition_store import load_mapped_decomposition
+from hanzipy.util import iter_file_chunks
+
+CHUNK_SIZE = 1 << 16
+
+logger = logging.getLogger(__name__)
+
+# HanziDecomposer of each worker process, loaded once by init_worker
+worker_decomposer = None
+
+
+def init_worker(store, compiled_path):
+    global worker_decomposer
+    worker_decomposer = HanziDecomposer(store=store, compiled_path=compiled_path)
+
+
+def decompose_chunk(chunk, decomposition_type=None):
+    return dict(worker_decomposer.iter_decompose([chunk], decomposition_type))
+
+
+def iter_text_chunks(texts, chunk_size=CHUNK_SIZE):
+    """Regroups texts, an iterable of strings or a file, in chunk_size chunks."""
+    if hasattr(texts, "read"):
+        yield from iter_file_chunks(texts, chunk_size)
+        return
+
+    pending = []
+    pending_size = 0
+    for text in texts:
+        pending.append(text)
+        pending_size += len(text)
+
+        if pending_size >= chunk_size:
+            text = "".join(pending)
+            end = len(text) - len(text) % chunk_size
+            for start in range(0, end, chunk_size):
+                yield text[start : start + chunk_size]
+
+            pending = [text[end:]]
+            pending_size = len(pending[0])
+
+    if pending_size:
+        yield "".join(pending)
+
+
+class ParallelDecomposer:
+    """
+    Spreads iter_decompose over a pool of worker processes.
+
+    Each worker loads its own HanziDecomposer once. With the default
+    "mmap" store, the decomposition data is compiled once by the parent process
+    and every worker maps the same read-only file. If it can't be compiled,
+    the workers load the "dict" store instead.
+
+    Chunks are processed in parallel but their results are always
+    returned in input order, so the output does not depend on the scheduling.
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        chunk_size=CHUNK_SIZE,
+        store="mmap",
+        compiled_path=None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        compiled_path = compiled_path or COMPILED_DECOMPOSITION
+
+        if store == "mmap":
+            # compile before the workers start, so that they don't all do it
+            try:
+                load_mapped_decomposition(
+                    "{}/data/cjk_decomp.txt".format(CURRENT_DIR), compiled_path
+                ).close()
+            except OSError as err:
+                logger.warning("Workers use the dict store instead of mmap: %s", err)
+                store = "dict"
+
+        self.store = store
+
+        self.pool = Pool(
+            self.workers,
+            initializer=init_worker,
+            initargs=(store, compiled_path),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def iter_chunks(self, texts, decomposition_type=None):
+        """
+        Yields one {character: decomposition} dict per chunk of texts,
+        in input order, holding the characters first seen in that chunk.
+
+        Deduplication happens in this process, with a C speed scan of each chunk,
+        so only characters never seen before are sent to the workers.
+        At most two chunks per worker are in flight at any time.
+        """
+        seen = set()
+        pending = deque()
+
+        for chunk in iter_text_chunks(texts, self.chunk_size):
+            new_characters = "".join(
+                character for character in dict.fromkeys(chunk) if character not in seen
+            )
+            seen.update(new_characters)
+
+            if new_characters:
+                pending.append(
+                    self.pool.apply_async(
+                        decompose_chunk, (new_characters, decomposition_type)
+                    )
+                )
+            else:
+                pending.append({})
+
+            if len(pending) >= self.workers * 2:
+                yield self.result(pending.popleft())
+
+        while pending:
+            yield self.result(pending.popleft())
+
+    def result(self, pending_result):
+        if isinstance(pending_result, dict):
+            return pending_result
+
+        return pending_result.get()
+
+    def decompose_many(self, texts, decomposition_type=None):
+        """
+        Merged results of iter_chunks, in order of first occurrence,
+        the same as dict(HanziDecomposer().iter_decompose(texts)).
+        """
+        decomposed_components = {}
+
+        for chunk_result in self.iter_chunks(texts, decomposition_type):
+            decomposed_components.update(chunk_result)
+
+        return decomposed_components
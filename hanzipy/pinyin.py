@@ -0,0 +1,153 @@
+# coding:utf-8
+import threading
+from array import array
+
+# Syllable codes below MATRIX_CAPACITY get their regularities memoized
+# in a MATRIX_CAPACITY x MATRIX_CAPACITY byte matrix.
+# Mandarin has about 1,600 distinct toned syllables.
+MATRIX_CAPACITY = 2048
+UNKNOWN_REGULARITY = 0xFF
+
+
+class PinyinSyllable:
+    __slots__ = ("raw_syllable", "toneless", "initial_part", "final_part", "tone")
+
+    def __init__(self, raw_syllable):
+        self.raw_syllable = raw_syllable
+        self.toneless = raw_syllable[: len(raw_syllable) - 1]
+
+        if raw_syllable[1:2] == "h":
+            # Take into zh, ch, sh
+            self.initial_part = raw_syllable[0:2]
+        else:
+            self.initial_part = raw_syllable[0:1]
+
+        self.final_part = self.toneless.replace(self.initial_part, "")
+        tone = raw_syllable[-1:]
+        self.tone = int(tone) if tone.isdigit() else 0
+
+    @classmethod
+    def get(cls, raw_syllable):
+        """Interned, lowercased, syllable of the process-wide PINYIN_TABLE."""
+        return PINYIN_TABLE.syllable(raw_syllable)
+
+    def syllable(self):
+        return self.toneless
+
+    def initial(self):
+        return self.initial_part
+
+    def final(self):
+        return self.final_part
+
+
+class PinyinTable:
+    """
+    Interned pinyin syllables.
+
+    Every distinct lowercased syllable is parsed once and gets an integer code,
+    with the codes of its toneless syllable, initial and final and its tone
+    stored in parallel columns. Regularities between two codes are computed once
+    and then read from a 2D matrix.
+    """
+
+    def __init__(self, capacity=MATRIX_CAPACITY):
+        # raw pinyin, as given and lowercased -> code
+        self.codes = {}
+        self.syllables = []
+        self.parts = {}
+        self.toneless_codes = array("I")
+        self.initial_codes = array("I")
+        self.final_codes = array("I")
+        self.tones = array("B")
+        self.capacity = capacity
+        self.matrix = None
+        self.lock = threading.Lock()
+
+    def part_code(self, part):
+        code = self.parts.get(part)
+        if code is None:
+            code = self.parts[part] = len(self.parts)
+
+        return code
+
+    def encode(self, raw_syllable):
+        code = self.codes.get(raw_syllable)
+        if code is None:
+            code = self.add(raw_syllable)
+
+        return code
+
+    def add(self, raw_syllable):
+        with self.lock:
+            lowered = raw_syllable.lower()
+            code = self.codes.get(lowered)
+
+            if code is None:
+                pinyin_syllable = PinyinSyllable(lowered)
+                self.toneless_codes.append(self.part_code(pinyin_syllable.toneless))
+                self.initial_codes.append(self.part_code(pinyin_syllable.initial_part))
+                self.final_codes.append(self.part_code(pinyin_syllable.final_part))
+                self.tones.append(pinyin_syllable.tone)
+                # published last, once its columns are filled
+                code = len(self.syllables)
+                self.syllables.append(pinyin_syllable)
+                self.codes[lowered] = code
+
+            self.codes[raw_syllable] = code
+
+        return code
+
+    def syllable(self, raw_syllable):
+        return self.syllables[self.encode(raw_syllable)]
+
+    def compute_regularity(self, charpinyin, phonetic_pinyin):
+        # Regularity Scale:
+        # 0 = No regularity
+        # 1 = Exact Match (with tone)
+        # 2 = Syllable Match (without tone)
+        # 3 = Similar in Initial
+        # 4 = Similar in Final
+        if self.toneless_codes[charpinyin] == self.toneless_codes[phonetic_pinyin]:
+            return 1 if charpinyin == phonetic_pinyin else 2
+
+        if self.final_codes[charpinyin] == self.final_codes[phonetic_pinyin]:
+            return 4
+
+        if self.initial_codes[charpinyin] == self.initial_codes[phonetic_pinyin]:
+            return 3
+
+        return 0
+
+    def regularity(self, charpinyin, phonetic_pinyin):
+        """Regularity scale between two codes, a single matrix read once known."""
+        if charpinyin >= self.capacity or phonetic_pinyin >= self.capacity:
+            return self.compute_regularity(charpinyin, phonetic_pinyin)
+
+        if self.matrix is None:
+            self.matrix = bytearray([UNKNOWN_REGULARITY]) * (
+                self.capacity * self.capacity
+            )
+
+        index = charpinyin * self.capacity + phonetic_pinyin
+        regularity = self.matrix[index]
+        if regularity == UNKNOWN_REGULARITY:
+            regularity = self.matrix[index] = self.compute_regularity(
+                charpinyin, phonetic_pinyin
+            )
+
+        return regularity
+
+    def regularities(self, charpinyin_codes, phonetic_pinyin_codes):
+        """Regularity of every (charpinyin, phonetic pinyin) pair of codes."""
+        regularity = self.regularity
+
+        return [
+            regularity(charpinyin, phonetic_pinyin)
+            for charpinyin, phonetic_pinyin in zip(
+                charpinyin_codes, phonetic_pinyin_codes
+            )
+        ]
+
+
+PINYIN_TABLE = PinyinTable()
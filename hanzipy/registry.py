@@ -0,0 +1,84 @@
+# coding:utf-8
+"""
+Process-wide registry of loaded datasets, so that one HanziDecomposer
+and one HanziDictionary per set of options serve the whole interpreter.
+"""
+import threading
+
+REGISTRY = {}
+# registry key -> options, keeping alive the values keyed by id()
+REGISTRY_OPTIONS = {}
+REGISTRY_LOCK = threading.RLock()
+
+
+def option_key(value):
+    """
+    Hashable key of an option value. Dicts, lists and sets are keyed
+    by their content, other unhashable values by identity.
+    """
+    if isinstance(value, dict):
+        return (
+            dict,
+            tuple(sorted((key, option_key(item)) for key, item in value.items())),
+        )
+
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(option_key(item) for item in value))
+
+    if isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(option_key(item) for item in value))
+
+    try:
+        hash(value)
+    except TypeError:
+        return (id, id(value))
+
+    return value
+
+
+def registry_key(cls, options):
+    return (cls, option_key(options))
+
+
+def get_instance(cls, options):
+    key = registry_key(cls, options)
+    instance = REGISTRY.get(key)
+
+    if instance is None:
+        with REGISTRY_LOCK:
+            instance = REGISTRY.get(key)
+            if instance is None:
+                instance = REGISTRY[key] = cls(**options)
+                REGISTRY_OPTIONS[key] = options
+
+    return instance
+
+
+def get_decomposer(**options):
+    """Shared HanziDecomposer(**options), loaded on first call."""
+    from hanzipy.decomposer import HanziDecomposer
+
+    return get_instance(HanziDecomposer, options)
+
+
+def get_dictionary(**options):
+    """Shared HanziDictionary(**options), loaded on first call."""
+    from hanzipy.dictionary import HanziDictionary
+
+    return get_instance(HanziDictionary, options)
+
+
+def register(instance, **options):
+    """Makes instance the shared one for its class and options."""
+    with REGISTRY_LOCK:
+        key = registry_key(type(instance), options)
+        REGISTRY[key] = instance
+        REGISTRY_OPTIONS[key] = options
+
+    return instance
+
+
+def clear():
+    with REGISTRY_LOCK:
+        REGISTRY.clear()
+        REGISTRY_OPTIONS.clear()
@@ -0,0 +1,140 @@
+# coding:utf-8
+import re
+from math import log
+
+from hanzipy.trie import CHARACTER_BITS
+from hanzipy.util import iter_file_chunks
+
+# Runs of characters that may form dictionary words,
+# anything else is a token of its own.
+BLOCK_REGEX = re.compile("([\u4e00-\u9fffA-Za-z0-9]+)")
+ALPHANUMERIC_REGEX = re.compile("[A-Za-z0-9]")
+
+
+class HanziSegmenter:
+    """
+    Dictionary based word segmenter.
+
+    For each run of Hanzi, every dictionary word starting at every position
+    is found by walking the dictionary word trie, which gives the DAG
+    of all possible segmentations. The path with the highest probability,
+    the sum of the log frequencies of its words in the Leiden corpus,
+    is then chosen by dynamic programming, from the end of the run.
+
+    Words without a Leiden frequency, and characters that are not in the
+    dictionary, count as seen once.
+    """
+
+    def __init__(self, dictionary):
+        self.word_trie = dictionary.word_trie
+        word_freq = dictionary.word_freq
+        total = sum(word_freq.values()) + len(self.word_trie)
+        self.unknown_log_probability = -log(total)
+
+        # Log probability of the word ending at each terminal trie node
+        self.log_probabilities = [self.unknown_log_probability] * len(
+            self.word_trie.terminals
+        )
+        for word in self.word_trie:
+            self.log_probabilities[self.word_trie.find_node(word)] = log(
+                word_freq.get(word, 0) + 1
+            ) - log(total)
+
+    def segment(self, text):
+        """Words of text, in order, joining back to text."""
+        words = []
+
+        for block_id, block in enumerate(BLOCK_REGEX.split(text)):
+            if block_id % 2:
+                words.extend(self.segment_block(block))
+            else:
+                # text between blocks, one token per character
+                words.extend(block)
+
+        return words
+
+    def segment_block(self, block):
+        edges = self.word_trie.edges
+        terminals = self.word_trie.terminals
+        log_probabilities = self.log_probabilities
+        unknown_log_probability = self.unknown_log_probability
+        codes = [ord(character) for character in block]
+        length = len(codes)
+
+        # best[start]: log probability of the best path from start to the end,
+        # ends[start]: end of the first word of that path
+        best = [0.0] * (length + 1)
+        ends = list(range(1, length + 2))
+
+        for start in range(length - 1, -1, -1):
+            best_score = unknown_log_probability + best[start + 1]
+            node = 0
+
+            for end in range(start, length):
+                node = edges.get((node << CHARACTER_BITS) | codes[end])
+                if node is None:
+                    break
+
+                if terminals[node]:
+                    score = log_probabilities[node] + best[end + 1]
+                    if score > best_score:
+                        best_score = score
+                        ends[start] = end + 1
+
+            best[start] = best_score
+
+        words = []
+        start = 0
+        alphanumeric = ""
+
+        while start < length:
+            end = ends[start]
+            word = block[start:end]
+
+            # joins back unknown latin words and numbers split per character
+            if end - start == 1 and ALPHANUMERIC_REGEX.match(word):
+                alphanumeric += word
+            else:
+                if alphanumeric:
+                    words.append(alphanumeric)
+                    alphanumeric = ""
+                words.append(word)
+
+            start = end
+
+        if alphanumeric:
+            words.append(alphanumeric)
+
+        return words
+
+    def iter_segment(self, texts, chunk_size=1 << 16):
+        """
+        Streaming segment: yields the words of texts, an iterable of strings
+        or a file-like object read chunk_size characters at a time.
+
+        Text is only cut between runs of Hanzi, so that words
+        don't depend on how the input is split.
+        """
+        if hasattr(texts, "read"):
+            texts = iter_file_chunks(texts, chunk_size)
+
+        pending = ""
+        for text in texts:
+            text = pending + text
+            blocks = BLOCK_REGEX.split(text)
+
+            # the last run may continue in the next text,
+            # unless it is already longer than a chunk
+            pending = ""
+            if len(blocks) > 1 and not blocks[-1] and len(blocks[-2]) <= chunk_size:
+                pending = blocks[-2]
+                text = text[: len(text) - len(pending)]
+
+            yield from self.segment(text)
+
+        if pending:
+            yield from self.segment(pending)
+
+    def segment_many(self, texts):
+        """Segments every text of texts, one list of words each."""
+        return [self.segment(text) for text in texts]
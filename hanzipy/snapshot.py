@@ -0,0 +1,111 @@
+# coding:utf-8
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+
+CURRENT_DIR = BASE_DIR = Path(__file__).parent
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of a snapshot payload changes,
+# older snapshots are then discarded and rebuilt.
+SNAPSHOT_VERSION = 4
+SNAPSHOT_DIR = Path(os.environ.get("HANZIPY_SNAPSHOT_DIR", CURRENT_DIR / "data"))
+
+
+def file_checksum(filepath):
+    digest = hashlib.sha1()
+
+    with open(filepath, "rb") as source_file:
+        for chunk in iter(lambda: source_file.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def source_checksums(filepaths):
+    return {Path(filepath).name: file_checksum(filepath) for filepath in filepaths}
+
+
+def load_snapshot(snapshot_path, sources):
+    """
+    Returns the payload stored in snapshot_path,
+    or None if it is missing, corrupted, from another SNAPSHOT_VERSION
+    or built from source files that changed since.
+    """
+    try:
+        with open(snapshot_path, "rb") as snapshot_file:
+            header = pickle.load(snapshot_file)
+
+            if header.get("version") != SNAPSHOT_VERSION:
+                logger.debug("Snapshot %s is outdated", snapshot_path)
+                return
+
+            if header.get("checksums") != source_checksums(sources):
+                logger.debug("Snapshot %s is stale", snapshot_path)
+                return
+
+            return pickle.load(snapshot_file)
+
+    except FileNotFoundError:
+        return
+    except (
+        OSError,
+        EOFError,
+        ValueError,
+        AttributeError,
+        pickle.UnpicklingError,
+    ) as err:
+        logger.warning("Could not read snapshot %s: %s", snapshot_path, err)
+        return
+
+
+def write_snapshot(snapshot_path, payload, sources):
+    """
+    Atomically writes payload to snapshot_path. Returns False if the
+    location is not writable, the caller then simply keeps parsing the sources.
+    """
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "checksums": source_checksums(sources),
+    }
+    snapshot_path = Path(snapshot_path)
+    tmp_path = snapshot_path.with_name(
+        "{}.{}.tmp".format(snapshot_path.name, os.getpid())
+    )
+
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as snapshot_file:
+            pickle.dump(header, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+    except OSError as err:
+        logger.warning("Could not write snapshot %s: %s", snapshot_path, err)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+    return True
+
+
+def build_snapshots():
+    from hanzipy.decomposer import COMPILED_DECOMPOSITION
+    from hanzipy.decomposition_store import compile_decomposition
+    from hanzipy.dictionary import HanziDictionary
+
+    dictionary = HanziDictionary(use_snapshot=False)
+    dictionary.save_snapshot()
+    compile_decomposition(
+        "{}/data/cjk_decomp.txt".format(CURRENT_DIR), COMPILED_DECOMPOSITION
+    )
+
+    return [dictionary.snapshot_path, COMPILED_DECOMPOSITION]
+
+
+if __name__ == "__main__":
+    for path in build_snapshots():
+        print(path)
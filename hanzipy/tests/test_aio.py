@@ -0,0 +1,114 @@
+# coding:utf-8
+import asyncio
+import io
+import threading
+import time
+
+from hanzipy import registry
+from hanzipy.aio import AsyncHanzi
+from hanzipy.decomposer import HanziDecomposer
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+async def ticker(latencies, stop, interval=0.005):
+    """Records how late the event loop wakes up a sleeping task"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        latencies.append(time.perf_counter() - start - interval)
+
+
+class TestAsyncHanzi:
+    def test_event_loop_latency(self):
+        async def main():
+            latencies = []
+            stop = asyncio.Event()
+            ticks = asyncio.ensure_future(ticker(latencies, stop))
+
+            start = time.perf_counter()
+            hanzi = AsyncHanzi(decomposer_options={"lazy_components": False})
+            async with hanzi:
+                await hanzi.async_load(dictionary=False)
+                results = await asyncio.gather(
+                    *[
+                        hanzi.decompose_many("我们都是陌生人" * 50 + character)
+                        for character in "的一是不了人我在有他这中大来上国个到说们为"
+                    ]
+                )
+            elapsed = time.perf_counter() - start
+
+            stop.set()
+            await ticks
+            return results, latencies, elapsed
+
+        results, latencies, elapsed = asyncio.run(main())
+
+        assert len(results) == 21
+        assert results[0]["我"] == HanziDecomposer().decompose("我")
+        # the loop kept ticking while loading and decomposing
+        assert len(latencies) > 10
+        assert max(latencies) < elapsed / 2
+
+    def test_coalescing(self):
+        calls = []
+        calls_lock = threading.Lock()
+
+        def slow_decompose(character, decomposition_type=None):
+            with calls_lock:
+                calls.append(character)
+            time.sleep(0.05)
+            return {"character": character}
+
+        async def main():
+            async with AsyncHanzi() as hanzi:
+                decomposer = await hanzi.get_decomposer()
+                decomposer.decompose = slow_decompose
+
+                results = await asyncio.gather(
+                    *[hanzi.decompose("是") for _ in range(20)], hanzi.decompose("爱")
+                )
+                # done calls are not cached
+                await hanzi.decompose("是")
+
+            return results
+
+        results = asyncio.run(main())
+
+        assert sorted(calls) == ["是", "是", "爱"]
+        assert all(result is results[0] for result in results[:20])
+        assert results[-1] == {"character": "爱"}
+
+    def test_errors(self):
+        async def main():
+            async with AsyncHanzi() as hanzi:
+                return await asyncio.gather(
+                    hanzi.decompose_many("test"),
+                    hanzi.decompose_many("test"),
+                    return_exceptions=True,
+                )
+
+        results = asyncio.run(main())
+
+        assert all(isinstance(result, Exception) for result in results)
+
+    def test_aiter_decompose(self):
+        text = "我们都是陌生人。" * 100
+
+        async def main():
+            async with AsyncHanzi() as hanzi:
+                return [
+                    pair
+                    async for pair in hanzi.aiter_decompose(
+                        io.StringIO(text), batch_size=2
+                    )
+                ]
+
+        assert asyncio.run(main()) == list(HanziDecomposer().iter_decompose([text]))
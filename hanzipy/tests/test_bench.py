@@ -0,0 +1,72 @@
+# coding:utf-8
+import json
+import logging
+
+from hanzipy.bench import suite
+from hanzipy.bench.__main__ import main
+
+
+def results(**operations):
+    return {
+        "results": {
+            name: {"ops_per_sec": ops_per_sec, "p50_ms": p50_ms, "p99_ms": p50_ms * 2}
+            for name, (ops_per_sec, p50_ms) in operations.items()
+        }
+    }
+
+
+class TestBenchSuite:
+    def test_fixed_inputs(self):
+        characters = suite.fixed_inputs(suite.csv_characters())
+
+        assert characters == suite.fixed_inputs(suite.csv_characters())
+        assert characters[:2] == ["的", "一"]
+        assert len(characters) == suite.TOP_CHARACTERS + suite.SAMPLED_CHARACTERS
+        assert len(set(characters)) == len(characters)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        assert suite.percentile(values, 0.5) == 50
+        assert suite.percentile(values, 0.99) == 99
+        assert suite.percentile([7], 0.99) == 7
+
+    def test_compare(self):
+        baseline = results(decompose=(1000, 1.0), segment=(100, 10.0))
+        changes = suite.compare(
+            results(decompose=(800, 1.2), segment=(105, 9.8), search=(1, 1)),
+            baseline,
+        )
+
+        assert changes["decompose"]["regression"] is True
+        assert round(changes["decompose"]["ops_per_sec"], 2) == -0.2
+        assert changes["segment"]["regression"] is False
+        # not in the baseline
+        assert "search" not in changes
+
+    def test_quiet_logging(self):
+        logger = logging.getLogger("hanzipy")
+
+        with suite.quiet_logging():
+            assert not logger.isEnabledFor(logging.INFO)
+            assert logging.getLogger("hanzipy.dictionary").isEnabledFor(logging.WARNING)
+
+        assert logger.level == logging.NOTSET
+        assert logging.root.manager.disable == logging.NOTSET
+
+    def test_main(self, tmp_path, capsys):
+        json_path = tmp_path / "results.json"
+
+        assert main(["decompose", "--no-isolate", "--json", str(json_path)]) == 0
+
+        result = json.loads(json_path.read_text())["results"]["decompose"]
+        assert result["calls"] == suite.ROUNDS * (
+            suite.TOP_CHARACTERS + suite.SAMPLED_CHARACTERS
+        )
+        assert 0 < result["p50_ms"] <= result["p99_ms"]
+        assert "decompose" in capsys.readouterr().out
+
+        # an impossibly fast baseline
+        baseline = results(decompose=(result["ops_per_sec"] * 10, result["p50_ms"]))
+        json_path.write_text(json.dumps(baseline))
+        assert main(["decompose", "--no-isolate", "--baseline", str(json_path)]) == 1
@@ -0,0 +1,124 @@
+# coding:utf-8
+import time
+
+from hanzipy.cache import CachedMethod, LRUCache, SQLiteCache, TieredCache
+from hanzipy.dictionary import HanziDictionary
+
+import pytest
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    return SQLiteCache(tmp_path / "results.sqlite", max_entries=2)
+
+
+class TestLRUCache:
+    def test_lru(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        # b was the least recently used
+        assert cache.get("b", None) is None
+        assert cache.get("c") == 3
+        assert cache.stats() == {
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": 2 / 3,
+            "evictions": 1,
+            "expirations": 0,
+            "size": 2,
+        }
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a", None) is None
+        assert cache.stats()["expirations"] == 1
+
+
+class TestSQLiteCache:
+    def test_get_set(self, sqlite_cache, tmp_path):
+        sqlite_cache.set("a", {"pinyin": ["ju4"]})
+
+        assert sqlite_cache.get("a") == {"pinyin": ["ju4"]}
+        # shared by every instance using the same file
+        assert SQLiteCache(tmp_path / "results.sqlite").get("a") == {"pinyin": ["ju4"]}
+
+        sqlite_cache.set("b", 2)
+        sqlite_cache.set("c", 3)
+        assert sqlite_cache.get("a", None) is None
+        assert sqlite_cache.stats()["evictions"] == 1
+        assert sqlite_cache.stats()["size"] == 2
+
+        sqlite_cache.clear()
+        assert sqlite_cache.get("b", None) is None
+
+    def test_tiered(self, sqlite_cache):
+        lru_cache = LRUCache()
+        cache = TieredCache(lru_cache, sqlite_cache)
+        sqlite_cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert lru_cache.get("a") == 1
+
+
+class TestCachedMethod:
+    def test_cached_method(self):
+        calls = []
+
+        def lookup(character, character_type=None):
+            calls.append(character)
+            return [character]
+
+        cached_lookup = CachedMethod(lookup, LRUCache(), copy=list)
+
+        assert cached_lookup("句") == ["句"]
+        result = cached_lookup("句")
+        result.append("子")
+
+        assert cached_lookup("句") == ["句"]
+        assert cached_lookup("句", character_type="only") == ["句"]
+        assert calls == ["句", "句"]
+
+    def test_cached_none(self):
+        cached_lookup = CachedMethod(lambda character: None, LRUCache(), copy=list)
+
+        assert cached_lookup("句") is None
+        assert cached_lookup("句") is None
+
+
+class TestDictionaryCaches:
+    def test_caches(self):
+        hanzi_dictionary = HanziDictionary(
+            caches={"dictionary_search": LRUCache(), "get_examples": LRUCache()}
+        )
+        uncached_dictionary = HanziDictionary()
+
+        for _ in range(3):
+            assert hanzi_dictionary.get_examples("句") == (
+                uncached_dictionary.get_examples("句")
+            )
+            assert hanzi_dictionary.dictionary_search("句", "only") == (
+                uncached_dictionary.dictionary_search("句", "only")
+            )
+
+        stats = hanzi_dictionary.cache_stats()
+        assert stats["get_examples"]["hits"] == 2
+        assert stats["dictionary_search"]["misses"] == 2
+
+        with pytest.raises(ValueError):
+            HanziDictionary(caches={"get_pinyin": LRUCache()})
+
+    def test_cached_regularity_without_pinyin(self):
+        hanzi_dictionary = HanziDictionary(
+            caches={"determine_phonetic_regularity": LRUCache()}
+        )
+
+        for _ in range(2):
+            assert hanzi_dictionary.determine_phonetic_regularity("test") is None
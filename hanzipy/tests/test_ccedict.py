@@ -0,0 +1,100 @@
+# coding:utf-8
+import io
+
+from hanzipy.ccedict import (
+    CCEDICT_STARTING_LINE,
+    iter_ccedict_groups,
+    load_ccedict,
+    parse_ccedict_line,
+)
+from hanzipy.dictionary import CURRENT_DIR
+
+CCEDICT_SAMPLE = """# CC-CEDICT
+# header
+乾 干 [gan1] /dry/clean/
+乾 干 [qian2] /surname Qian/
+幹 干 [gan4] /tree trunk/to do/
+干 干 [gan1] /to concern/shield/
+一 一 [yi1] /one/1/single/a(n)/
+發 发 [fa1] /to send out/to show (one's feeling)/
+髮 发 [fa4] /hair/
+乾 乾 [qian2] /one of the Eight Trigrams/
+"""
+
+
+def reference_load_ccedict(lines, starting_line):
+    """compute_dictionary as it was, one line at a time"""
+    dictionary_simplified = {}
+    dictionary_traditional = {}
+
+    for line in lines[starting_line:]:
+        elements = line.split(" ")
+        entry = {
+            "traditional": elements[0],
+            "simplified": elements[1],
+            "pinyin": line[line.index("[") + 1 : line.index("]")],
+            "definition": line[line.index("/") + 1 : line.rindex("/")],
+        }
+
+        simplified = dictionary_simplified.get(entry["simplified"])
+        traditional = dictionary_traditional.get(entry["traditional"])
+
+        if simplified:
+            simplified.append(entry)
+        elif traditional:
+            traditional.append(entry)
+        else:
+            dictionary_simplified[entry["simplified"]] = [entry]
+            dictionary_traditional[entry["traditional"]] = dictionary_simplified[
+                entry["simplified"]
+            ]
+
+    return dictionary_simplified, dictionary_traditional
+
+
+class TestCCEdict:
+    def test_parse_ccedict_line(self):
+        assert parse_ccedict_line("髮 发 [fa4] /hair/\n") == {
+            "traditional": "髮",
+            "simplified": "发",
+            "pinyin": "fa4",
+            "definition": "hair",
+        }
+
+    def test_iter_ccedict_groups(self):
+        groups = list(iter_ccedict_groups(io.StringIO(CCEDICT_SAMPLE), 2))
+
+        assert [len(group) for group in groups] == [2, 1, 1, 1, 1, 1, 1]
+        assert [entry["pinyin"] for entry in groups[0]] == ["gan1", "qian2"]
+
+    def test_load_ccedict(self):
+        dictionary_simplified, dictionary_traditional = load_ccedict(
+            io.StringIO(CCEDICT_SAMPLE), 2
+        )
+
+        assert (dictionary_simplified, dictionary_traditional) == (
+            reference_load_ccedict(CCEDICT_SAMPLE.splitlines(True), 2)
+        )
+        assert [entry["traditional"] for entry in dictionary_simplified["干"]] == [
+            "乾",
+            "乾",
+            "幹",
+            "干",
+            "乾",
+        ]
+        # 幹 and 干 were added to the entries of 干, the simplified word,
+        # and 乾 乾 to the ones of 乾, the traditional word, that are the same list
+        assert "幹" not in dictionary_traditional
+        assert "乾" not in dictionary_simplified
+        assert dictionary_traditional["乾"] is dictionary_simplified["干"]
+
+    def test_load_ccedict_file(self):
+        filepath = "{}/data/cedict_ts.u8".format(CURRENT_DIR)
+
+        with open(filepath, encoding="utf-8") as ccedict_file:
+            maps = load_ccedict(ccedict_file, CCEDICT_STARTING_LINE)
+
+        with open(filepath, encoding="utf-8") as ccedict_file:
+            assert maps == reference_load_ccedict(
+                ccedict_file.readlines(), CCEDICT_STARTING_LINE
+            )
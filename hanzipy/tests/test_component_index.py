@@ -0,0 +1,75 @@
+# coding:utf-8
+from hanzipy.decomposer import HanziDecomposer
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def component_index():
+    return HanziDecomposer().component_index
+
+
+def tree_components(decomposer, character):
+    """Components of the whole decomposition tree of character"""
+    tree = set()
+    components = decomposer.get_components(character)
+
+    if components != character:
+        for component in components:
+            if component != character:
+                if not component.isdigit():
+                    tree.add(component)
+                tree |= tree_components(decomposer, component)
+
+    return tree
+
+
+class TestComponentIndex:
+    def test_intersect(self, component_index):
+        result = component_index.intersect(["氵", "木", "目"])
+
+        # 目 is not a direct component of 湘, but of 相
+        assert result[0] == "湘"
+        assert "目" not in component_index.decomposer.once_decomposition("湘")
+        for character in result:
+            assert {"氵", "木", "目"} <= tree_components(
+                component_index.decomposer, character
+            )
+
+        assert component_index.intersect(["氵", "木", "目"], limit=1) == ["湘"]
+        assert component_index.intersect(["氵", "toto"]) == []
+        assert component_index.intersect([]) == []
+
+    def test_ranking(self, component_index):
+        result = component_index.intersect(["口"])
+
+        assert result[:3] == ["的", "是", "中"]
+        assert [component_index.ids[character] for character in result] == sorted(
+            component_index.ids[character] for character in result
+        )
+        assert component_index.intersect(["口"], limit=3) == result[:3]
+        assert component_index.count("口") == len(result)
+
+    def test_union(self, component_index):
+        water = set(component_index.intersect(["氵"]))
+        tree = set(component_index.intersect(["木"]))
+        mouth = set(component_index.intersect(["口"]))
+        result = component_index.union(["氵", "木"], exclude=["口"])
+
+        assert set(result) == (water | tree) - mouth
+        assert "法" in result
+        assert "河" not in result
+        assert component_index.union([]) == []
+
+    def test_search(self, component_index):
+        water = component_index.intersect(["氵"])
+        tree_or_eye = set(component_index.union(["木", "目"]))
+        xiang = set(component_index.intersect(["相"]))
+
+        assert component_index.search(
+            all_of=["氵"], any_of=["木", "目"], none_of=["相"], limit=5
+        ) == [
+            character
+            for character in water
+            if character in tree_or_eye and character not in xiang
+        ][:5]
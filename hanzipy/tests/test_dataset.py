@@ -0,0 +1,158 @@
+# coding:utf-8
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from hanzipy.dataset import FrozenDataset
+from hanzipy.decomposer import HanziDecomposer
+from hanzipy.dictionary import HanziDictionary
+
+import pytest
+
+THREADS = 8
+CHARACTERS = (
+    "的一是不了人我在有他这中大来上国个到说们为子和你地出道也时年"
+    "得就那要下以生会自着去之过家学对可她里后小么心多天而能好都然"
+    "没日于起还发成事只作当想看文无开手十用主行方又如前所本见经头"
+    "面公同三已老从动两长知民样现分将外但身些与高意进把法此实回二"
+    "理美点月明其种声全工己话儿者向情部正名定女问力机给等几很业最"
+    "间新什打便位因重被走电四第门相次东政海口使教西再平真听世气信"
+    "北少关并内加化由却代军产入先山五太水万市眼体别处总才场师书"
+)
+
+
+@pytest.fixture(scope="module")
+def decomposer_dataset():
+    return HanziDecomposer().freeze(component_index=True)
+
+
+@pytest.fixture(scope="module")
+def dictionary_dataset():
+    return HanziDictionary().freeze(examples=True)
+
+
+def stress(tasks, threads=THREADS):
+    """Runs every task on every thread at once, returns their results."""
+    barrier = threading.Barrier(threads)
+
+    def run(_):
+        barrier.wait()
+        return [task() for task in tasks]
+
+    with ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(run, range(threads)))
+
+
+class TestFrozenDataset:
+    def test_read_only(self):
+        dataset = FrozenDataset(characters={"是": None})
+
+        assert dataset.characters == {"是": None}
+        with pytest.raises(AttributeError):
+            dataset.characters = {}
+        with pytest.raises(AttributeError):
+            del dataset.characters
+        with pytest.raises(AttributeError):
+            dataset.radicals
+
+        assert pickle.loads(pickle.dumps(dataset)).characters == {"是": None}
+
+    def test_decomposer_views(self, decomposer_dataset):
+        view = HanziDecomposer(dataset=decomposer_dataset)
+
+        assert view.characters is decomposer_dataset.characters
+        assert view.component_index is decomposer_dataset.component_index
+        assert view.decompose("湘") == HanziDecomposer().decompose("湘")
+
+    def test_decomposer_results_are_copies(self, decomposer_dataset):
+        view = HanziDecomposer(dataset=decomposer_dataset)
+        characters = view.get_characters_with_component("口")
+        components = view.get_components("是")
+
+        view.get_characters_with_component("口").append("toto")
+        view.get_components("是").pop()
+
+        other_view = HanziDecomposer(dataset=decomposer_dataset)
+        assert other_view.get_characters_with_component("口") == characters
+        assert other_view.get_components("是") == components
+
+    def test_dictionary_results_are_copies(self, dictionary_dataset):
+        view = HanziDictionary(dataset=dictionary_dataset)
+        definition = view.definition_lookup("是")
+        search = view.dictionary_search("是")
+        examples = view.get_examples("是")
+
+        view.definition_lookup("是")[0].pop("pinyin")
+        view.dictionary_search("是")[0]["definition"] = "toto"
+        for words in view.get_examples("是").values():
+            for word in words:
+                word.clear()
+            words.clear()
+
+        other_view = HanziDictionary(dataset=dictionary_dataset)
+        assert other_view.definition_lookup("是") == definition
+        assert other_view.dictionary_search("是") == search
+        assert other_view.get_examples("是") == examples
+
+    def test_concurrent_decomposer(self, decomposer_dataset):
+        shared_view = HanziDecomposer(dataset=decomposer_dataset)
+        expected = [
+            shared_view.decompose(character) for character in CHARACTERS
+        ] + [
+            shared_view.get_characters_with_component("口"),
+            shared_view.component_index.intersect(["氵", "木"], limit=20),
+        ]
+
+        def tasks(decomposer):
+            return [
+                lambda character=character: decomposer.decompose(character)
+                for character in CHARACTERS
+            ] + [
+                lambda: decomposer.get_characters_with_component("口"),
+                lambda: decomposer.component_index.intersect(["氵", "木"], limit=20),
+            ]
+
+        # one view shared by every thread
+        shared_view.clear_memo()
+        for results in stress(tasks(shared_view)):
+            assert results == expected
+
+        # one view per thread
+        local = threading.local()
+
+        def thread_view():
+            if not hasattr(local, "decomposer"):
+                local.decomposer = HanziDecomposer(dataset=decomposer_dataset)
+            return local.decomposer
+
+        view_tasks = [
+            lambda character=character: thread_view().decompose(character)
+            for character in CHARACTERS
+        ]
+        for results in stress(view_tasks):
+            assert results == expected[: len(CHARACTERS)]
+
+    def test_concurrent_dictionary(self, dictionary_dataset):
+        shared_view = HanziDictionary(dataset=dictionary_dataset)
+        characters = [
+            character
+            for character in CHARACTERS
+            if character in shared_view.simplified_index
+        ]
+        expected = [shared_view.get_examples(character) for character in characters] + [
+            shared_view.dictionary_search(character) for character in characters
+        ]
+
+        tasks = [
+            lambda character=character: shared_view.get_examples(character)
+            for character in characters
+        ] + [
+            lambda character=character: shared_view.dictionary_search(character)
+            for character in characters
+        ]
+
+        for results in stress(tasks):
+            assert results == expected
+
+        # the dataset was not written to
+        assert dictionary_dataset.examples.keys() == shared_view.examples.keys()
@@ -1,5 +1,7 @@
 # coding:utf-8
+import io
 import json
+import pickle
 from pathlib import Path
 
 from hanzipy.decomposer import HanziDecomposer
@@ -106,6 +108,99 @@ class TestDecomposer:
             phrase = "ひらがな"
             hanzi_decomposer.decompose_many(phrase)
 
+    def test_memo(self, hanzi_decomposer):
+        unmemoized_decomposer = HanziDecomposer(memo_size=0)
+
+        for character in ["是", "爱", "橄", "黃", "的"]:
+            assert hanzi_decomposer.decompose(
+                character
+            ) == unmemoized_decomposer.decompose(character)
+
+        hanzi_decomposer.clear_memo()
+        hanzi_decomposer.graphical_decomposition("是")
+        memo_info = hanzi_decomposer.memo_info()["graphical"]
+        assert memo_info["misses"] == memo_info["size"] > 0
+
+        # results are copies of the memoized tuples
+        result = hanzi_decomposer.graphical_decomposition("是")
+        result.append("口")
+        assert hanzi_decomposer.graphical_decomposition("是") == [
+            "口",
+            "一",
+            "一",
+            "龰",
+        ]
+        assert hanzi_decomposer.memo_info()["graphical"]["hits"] == memo_info["hits"] + 2
+
+    def test_pickle(self, hanzi_decomposer):
+        hanzi_decomposer.decompose("是")
+        unpickled_decomposer = pickle.loads(pickle.dumps(hanzi_decomposer))
+
+        assert unpickled_decomposer.memo_info()["graphical"]["size"] == 0
+        assert unpickled_decomposer.decompose("是") == hanzi_decomposer.decompose("是")
+        assert unpickled_decomposer.memo_info()["graphical"]["size"] > 0
+
+    def test_pickle_mmap(self, tmp_path):
+        hanzi_decomposer = HanziDecomposer(
+            store="mmap", compiled_path=tmp_path / "cjk_decomp.bin"
+        )
+        unpickled_decomposer = pickle.loads(pickle.dumps(hanzi_decomposer))
+
+        assert unpickled_decomposer.store == "mmap"
+        assert unpickled_decomposer.decompose("是") == hanzi_decomposer.decompose("是")
+
+    def test_pickle_component_index(self, hanzi_decomposer):
+        result = hanzi_decomposer.component_index.intersect(["氵", "木"], limit=5)
+        unpickled_decomposer = pickle.loads(pickle.dumps(hanzi_decomposer))
+
+        assert unpickled_decomposer._component_index is None
+        assert unpickled_decomposer.component_index.intersect(["氵", "木"], limit=5) == (
+            result
+        )
+
+    def test_pickle_instrumentation(self):
+        hanzi_decomposer = HanziDecomposer(instrumentation=True)
+        hanzi_decomposer.decompose("是")
+        unpickled_decomposer = pickle.loads(pickle.dumps(hanzi_decomposer))
+        unpickled_decomposer.decompose("是")
+
+        stats = unpickled_decomposer.stats()["methods"]
+        assert stats["HanziDecomposer.decompose"]["calls"] == 2
+
+    def test_set_characters_with_component(self, hanzi_decomposer):
+        hanzi_decomposer.get_characters_with_component("⺌")
+        hanzi_decomposer.characters_with_component = {"⺌": ["光"], "口": ["品"]}
+
+        assert hanzi_decomposer.get_characters_with_component("口") == ["品"]
+        assert hanzi_decomposer.get_characters_with_component("⺌") == ["光"]
+
+    def test_iter_decompose(self, hanzi_decomposer):
+        texts = ["是的，", "爱是", "", "abc 的橄"]
+        result = list(hanzi_decomposer.iter_decompose(texts))
+
+        assert [character for character, _ in result] == ["是", "的", "爱", "橄"]
+        assert dict(result) == hanzi_decomposer.decompose_many("是的爱橄")
+
+        result = dict(hanzi_decomposer.iter_decompose(texts, 2))
+        assert result["爱"] == {
+            "character": "爱",
+            "components": ["爫", "冖", "𠂇", "又"],
+        }
+
+    def test_iter_decompose_file(self, hanzi_decomposer):
+        text_file = io.StringIO("是的\n爱是\n" * 1000)
+        result = hanzi_decomposer.iter_decompose(text_file, chunk_size=7)
+
+        assert [character for character, _ in result] == ["是", "的", "爱"]
+
+    def test_iter_decompose_binary_file(self, hanzi_decomposer):
+        binary_file = io.BytesIO("是的".encode())
+
+        with pytest.raises(TypeError):
+            list(hanzi_decomposer.iter_decompose(binary_file))
+        # an empty stream ends, whatever its mode
+        assert list(hanzi_decomposer.iter_decompose(io.BytesIO())) == []
+
     def test_is_radical(self, hanzi_decomposer):
         result = hanzi_decomposer.is_radical("是")
         assert result is False
@@ -170,9 +265,52 @@ class TestDecomposer:
         result = hanzi_decomposer.get_characters_with_component("test")
         assert result is None
 
+    def test_radical_groups(self, hanzi_decomposer):
+        assert hanzi_decomposer.find_same_meaning_radicals("囗") == ["囗", "⼞"]
+
+        characters = hanzi_decomposer.get_characters_with_component("囗", immutable=True)
+        assert isinstance(characters, tuple)
+        assert characters is hanzi_decomposer.get_characters_with_component(
+            "⼞", immutable=True
+        )
+        assert hanzi_decomposer.get_characters_with_component("囗") == list(characters)
+
+        # the returned list can be changed without altering the cache
+        hanzi_decomposer.get_characters_with_component("囗").clear()
+        assert hanzi_decomposer.get_characters_with_component("囗") == list(characters)
+
+    def test_lazy_components(self, hanzi_decomposer):
+        eager_decomposer = HanziDecomposer(lazy_components=False)
+        assert eager_decomposer._characters_with_component is not None
+
+        assert hanzi_decomposer._characters_with_component is None
+        assert hanzi_decomposer.get_characters_with_component(
+            "勺"
+        ) == eager_decomposer.get_characters_with_component("勺")
+        assert (
+            hanzi_decomposer.characters_with_component
+            == eager_decomposer.characters_with_component
+        )
+
     def test_component_exists(self, hanzi_decomposer):
         result = hanzi_decomposer.component_exists("乂")
         assert result is True
 
         result = hanzi_decomposer.component_exists("toto")
         assert result is False
+
+    def test_mmap_store(self, hanzi_decomposer, tmp_path):
+        mapped_decomposer = HanziDecomposer(
+            store="mmap", compiled_path=tmp_path / "cjk_decomp.bin"
+        )
+
+        for character in ["是", "爱", "橄", "黃", "乂", "toto"]:
+            assert mapped_decomposer.decompose(character) == hanzi_decomposer.decompose(
+                character
+            )
+            assert mapped_decomposer.component_exists(
+                character
+            ) == hanzi_decomposer.component_exists(character)
+
+        assert len(mapped_decomposer.characters) == len(hanzi_decomposer.characters)
+        mapped_decomposer.characters.close()
@@ -0,0 +1,102 @@
+# coding:utf-8
+from hanzipy import decomposition_store
+from hanzipy.decomposer import HanziDecomposer
+from hanzipy.decomposition_store import (
+    MappedDecomposition,
+    compile_decomposition,
+    load_mapped_decomposition,
+)
+
+import pytest
+
+DECOMPOSITION_DATA = """是:d(日,𤴓)
+日:c(日)
+𤴓:ra(一,龰)
+10003:d(白,干)
+"""
+
+
+@pytest.fixture
+def source(tmp_path):
+    source_path = tmp_path / "cjk_decomp.txt"
+    source_path.write_text(DECOMPOSITION_DATA, encoding="utf-8")
+    return source_path
+
+
+@pytest.fixture
+def mapped(source, tmp_path):
+    compiled_path = tmp_path / "cjk_decomp.bin"
+    compile_decomposition(source, compiled_path)
+    store = MappedDecomposition(compiled_path)
+    yield store
+    store.close()
+
+
+class TestMappedDecomposition:
+    def test_mapping(self, mapped):
+        assert len(mapped) == 4
+        assert set(mapped) == {"是", "日", "𤴓", "10003"}
+        assert mapped["是"] == {"decomposition_type": "d", "components": ["日", "𤴓"]}
+        assert mapped["𤴓"] == {
+            "decomposition_type": "ra",
+            "components": ["一", "龰"],
+        }
+
+        # components are not entries
+        assert "龰" not in mapped
+        assert "toto" not in mapped
+        with pytest.raises(KeyError):
+            mapped["龰"]
+
+    def test_get_components(self, mapped):
+        assert mapped.get_components("是") == ["日", "𤴓"]
+        assert mapped.get_components("10003") == ["白", "干"]
+
+        # compound and unknown characters are returned as is
+        assert mapped.get_components("日") == "日"
+        assert mapped.get_components("toto") == "toto"
+
+    def test_recompiled_when_stale(self, source, tmp_path):
+        compiled_path = tmp_path / "cjk_decomp.bin"
+        load_mapped_decomposition(source, compiled_path).close()
+
+        source.write_text(DECOMPOSITION_DATA + "的:a(白,勺)\n", encoding="utf-8")
+        store = load_mapped_decomposition(source, compiled_path)
+        assert store.get_components("的") == ["白", "勺"]
+        store.close()
+
+    def test_invalid_file(self, tmp_path):
+        compiled_path = tmp_path / "cjk_decomp.bin"
+        compiled_path.write_bytes(b"\0" * 64)
+
+        with pytest.raises(ValueError):
+            MappedDecomposition(compiled_path)
+
+    def test_unwritable_directory(self, source, tmp_path, monkeypatch):
+        # a file in place of the directory, unwritable even by root
+        (tmp_path / "readonly").write_text("")
+        compiled_path = tmp_path / "readonly" / "cjk_decomp.bin"
+        fallback_path = tmp_path / "cache" / "cjk_decomp.bin"
+        monkeypatch.setattr(
+            decomposition_store, "fallback_compiled_path", lambda path: fallback_path
+        )
+
+        store = load_mapped_decomposition(source, compiled_path)
+        assert store.get_components("是") == ["日", "𤴓"]
+        store.close()
+        assert fallback_path.exists()
+        assert list(fallback_path.parent.iterdir()) == [fallback_path]
+
+    def test_dict_store_fallback(self, source, tmp_path, monkeypatch):
+        (tmp_path / "readonly").write_text("")
+        compiled_path = tmp_path / "readonly" / "cjk_decomp.bin"
+        monkeypatch.setattr(
+            decomposition_store, "fallback_compiled_path", lambda path: compiled_path
+        )
+
+        with pytest.raises(OSError):
+            load_mapped_decomposition(source, compiled_path)
+
+        decomposer = HanziDecomposer(store="mmap", compiled_path=compiled_path)
+        assert decomposer.store == "dict"
+        assert decomposer.decompose("是") == HanziDecomposer().decompose("是")
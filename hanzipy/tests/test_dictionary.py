@@ -1,8 +1,11 @@
 # coding:utf-8
+import pickle
 from pathlib import Path
 
+from hanzipy.decomposer import HanziDecomposer
 from hanzipy.dictionary import HanziDictionary
 from hanzipy.exceptions import NotAHanziCharacter
+from hanzipy.registry import get_decomposer
 
 import pytest
 
@@ -596,6 +599,31 @@ class TestDictionary:
         assert result == []
 
 
+    def test_index_search(self, hanzi_dictionary):
+        for query in ["句", "學", "心的小孩真", "不好意思", "zz"]:
+            for character_type in [None, "only"]:
+                assert hanzi_dictionary.index_search(
+                    query, character_type
+                ) == hanzi_dictionary.regex_search(query, character_type)
+
+        # regex characters fall back to the regex search
+        result = hanzi_dictionary.dictionary_search("句.", "only")
+        assert result == hanzi_dictionary.regex_search("句.", "only")
+
+    def test_word_trie(self, hanzi_dictionary):
+        word_trie = hanzi_dictionary.word_trie
+        words = set(hanzi_dictionary.dictionary_simplified) | set(
+            hanzi_dictionary.dictionary_traditional
+        )
+
+        assert len(word_trie) == len(words)
+        assert word_trie.prefix_search("不好") == sorted(
+            word for word in words if word.startswith("不好")
+        )
+        assert "不好意思" in word_trie
+        assert word_trie.longest_prefix("不好意思啊") == "不好意思"
+        assert "不" in list(word_trie.iter_prefixes_of("不好意思啊"))
+
     def test_get_examples(self, hanzi_dictionary):
         freq_keys = ["high_frequency", "mid_frequency", "low_frequency"]
         result = hanzi_dictionary.get_examples("句")
@@ -880,6 +908,36 @@ class TestDictionary:
             ],
         }
 
+    def test_get_examples_cache(self, hanzi_dictionary):
+        for character in ["句", "橄", "學"]:
+            assert hanzi_dictionary.get_examples(
+                character
+            ) == hanzi_dictionary.compute_examples(character)
+            assert character in hanzi_dictionary.examples
+
+        # altering a result does not alter the cache
+        result = hanzi_dictionary.get_examples("句")
+        result["high_frequency"].clear()
+        assert hanzi_dictionary.get_examples("句") == hanzi_dictionary.compute_examples(
+            "句"
+        )
+
+        hanzi_dictionary.precompute_examples(["雪"])
+        assert "雪" in hanzi_dictionary.examples
+
+        # queries that aren't dictionary characters are not cached
+        hanzi_dictionary.get_examples("句子")
+        assert "句子" not in hanzi_dictionary.examples
+
+    def test_pickle(self, hanzi_dictionary):
+        regularity = hanzi_dictionary.determine_phonetic_regularity("清")
+        unpickled_dictionary = pickle.loads(pickle.dumps(hanzi_dictionary))
+
+        assert unpickled_dictionary.determine_phonetic_regularity("清") == regularity
+        assert unpickled_dictionary.get_examples("句") == (
+            hanzi_dictionary.get_examples("句")
+        )
+
     def test_determine_if_simplfied_char(self, hanzi_dictionary):
         simplified_char = hanzi_dictionary.determine_if_simplfied_char("句")
         traditional_char = hanzi_dictionary.determine_if_simplfied_char("學")
@@ -938,6 +996,24 @@ class TestDictionary:
         result = hanzi_dictionary.determine_phonetic_regularity("test")
         assert result is None
 
+    def test_decomposer(self, hanzi_dictionary):
+        # shared by every dictionary
+        assert hanzi_dictionary.decomposer is get_decomposer()
+
+        decomposer = HanziDecomposer()
+        dictionary = HanziDictionary(decomposer=decomposer)
+        assert dictionary.decomposer is decomposer
+
+    def test_determine_phonetic_regularities(self, hanzi_dictionary):
+        characters = ["句", "洋", "的", "學", "爱", "test"]
+        result = hanzi_dictionary.determine_phonetic_regularities(characters)
+
+        assert list(result) == characters
+        for character in characters:
+            assert result[character] == hanzi_dictionary.determine_phonetic_regularity(
+                character
+            )
+
     def test_get_character_frequency(self, hanzi_dictionary):
         result = hanzi_dictionary.get_character_frequency("热")
 
@@ -1005,3 +1081,22 @@ class TestDictionary:
         # no result
         with pytest.raises(NotAHanziCharacter):
             hanzi_dictionary.definition_lookup("test")
+
+    def test_snapshot(self, tmp_path):
+        snapshot_path = tmp_path / "dictionary.snapshot"
+        parsed = HanziDictionary(use_snapshot=False)
+        assert not snapshot_path.exists()
+
+        HanziDictionary(snapshot_path=snapshot_path)
+        assert snapshot_path.exists()
+
+        loaded = HanziDictionary(snapshot_path=snapshot_path)
+        assert loaded.dictionary_simplified == parsed.dictionary_simplified
+        assert loaded.dictionary_traditional == parsed.dictionary_traditional
+        assert loaded.char_freq == parsed.char_freq
+        assert loaded.word_freq == parsed.word_freq
+        assert (
+            loaded.character_frequency_count_index
+            == parsed.character_frequency_count_index
+        )
+        assert loaded.definition_lookup("雪") == parsed.definition_lookup("雪")
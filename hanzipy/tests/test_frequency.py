@@ -0,0 +1,47 @@
+# coding:utf-8
+from hanzipy.frequency import CharacterFrequency
+
+import pytest
+
+
+@pytest.fixture
+def char_freq():
+    char_freq = CharacterFrequency()
+    char_freq.add(1, "的", 7922684, 4.09432531783, "de/di2/di4", "of")
+    char_freq.add(2, "一", 3050722, 5.67089309742, "yi1", "one/1/single/a(n)")
+    char_freq.add(3, "是", 2615490, 7.02253944928, "shi4", "is/are/am/yes/to be")
+    return char_freq
+
+
+class TestCharacterFrequency:
+    def test_getitem(self, char_freq):
+        assert char_freq["一"] == {
+            "number": 2,
+            "character": "一",
+            "count": "3050722",
+            "percentage": "5.67089309742",
+            "pinyin": "yi1",
+            "meaning": "one/1/single/a(n)",
+        }
+
+        with pytest.raises(KeyError):
+            char_freq["爱"]
+
+    def test_mapping(self, char_freq):
+        assert len(char_freq) == 3
+        assert list(char_freq) == ["的", "一", "是"]
+        assert "是" in char_freq
+        assert "爱" not in char_freq
+
+    def test_numeric_columns(self, char_freq):
+        assert char_freq.count("是") == 2615490
+        assert char_freq.percentage("的") == 4.09432531783
+        assert char_freq.most_frequent(["爱", "是", "的"]) == ["的", "是", "爱"]
+        assert char_freq.most_frequent(["是", "一", "的"], limit=2) == ["的", "一"]
+
+    def test_override(self, char_freq):
+        char_freq.add(4, "是", 1, 0.5, "shi4", "to be")
+
+        assert len(char_freq) == 3
+        assert char_freq["是"]["number"] == 4
+        assert char_freq.count("是") == 1
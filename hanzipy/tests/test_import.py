@@ -0,0 +1,75 @@
+# coding:utf-8
+import logging
+import subprocess
+import sys
+
+import pytest
+
+import hanzipy
+
+
+def run_python(code, *options):
+    completed = subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed
+
+
+def imported_modules(code, *options):
+    """Modules imported by running code in a fresh interpreter, from -X importtime."""
+    stderr = run_python(code, "-X", "importtime", *options).stderr
+
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+class TestImport:
+    def test_import_hanzipy_is_lazy(self):
+        modules = imported_modules("import hanzipy")
+
+        assert "hanzipy" in modules
+        assert "hanzipy.dictionary" not in modules
+        assert "hanzipy.decomposer" not in modules
+        assert "sqlite3" not in modules
+
+    def test_dictionary_does_not_import_decomposer(self):
+        modules = imported_modules("import hanzipy.dictionary")
+
+        assert "hanzipy.dictionary" in modules
+        assert "hanzipy.decomposer" not in modules
+        assert "sqlite3" not in modules
+
+    def test_logging_is_left_to_the_application(self):
+        stdout = run_python(
+            "import logging\n"
+            "import hanzipy.decomposer, hanzipy.dictionary\n"
+            "root = logging.getLogger()\n"
+            "print(root.level, len(root.handlers))"
+        ).stdout
+
+        assert stdout.split() == [str(logging.WARNING), "0"]
+
+    def test_lazy_names(self):
+        from hanzipy.decomposer import HanziDecomposer
+        from hanzipy.registry import get_dictionary
+
+        assert hanzipy.HanziDecomposer is HanziDecomposer
+        assert hanzipy.get_dictionary is get_dictionary
+        assert "HanziDictionary" in dir(hanzipy)
+        assert set(hanzipy.LAZY_NAMES) <= set(hanzipy.__all__)
+
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError, match="NotAName"):
+            hanzipy.NotAName
+
+    def test_shortcuts(self):
+        from hanzipy.registry import get_decomposer
+
+        assert hanzipy.decompose("是") == get_decomposer().decompose("是")
+        assert hanzipy.decompose_many("是我") == get_decomposer().decompose_many("是我")
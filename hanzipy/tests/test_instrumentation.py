@@ -0,0 +1,56 @@
+# coding:utf-8
+from hanzipy.cache import LRUCache
+from hanzipy.decomposer import HanziDecomposer
+from hanzipy.dictionary import HanziDictionary
+from hanzipy.instrumentation import Instrumentation
+
+
+class TestInstrumentation:
+    def test_off(self):
+        decomposer = HanziDecomposer()
+
+        # nothing is wrapped
+        assert "decompose" not in vars(decomposer)
+        assert decomposer.stats()["methods"] == {}
+
+    def test_decomposer(self):
+        calls = []
+        instrumentation = Instrumentation(
+            callback=lambda name, elapsed: calls.append(name)
+        )
+        decomposer = HanziDecomposer(instrumentation=instrumentation)
+        decomposer.decompose("湘")
+        decomposer.decompose("湘")
+
+        stats = decomposer.stats()
+        methods = stats["methods"]
+        assert methods["HanziDecomposer.init_decomposition"]["calls"] == 1
+        assert methods["HanziDecomposer.decompose"]["calls"] == 2
+        # the second decomposition only hits the memos
+        assert methods["HanziDecomposer.compute_graphical_components"]["calls"] == (
+            stats["caches"]["graphical"]["misses"]
+        )
+        assert stats["caches"]["graphical"]["hit_rate"] > 0
+        assert calls.count("HanziDecomposer.decompose") == 2
+
+        instrumentation.reset()
+        assert decomposer.stats()["methods"] == {}
+
+    def test_dictionary(self):
+        instrumentation = Instrumentation()
+        hanzi_dictionary = HanziDictionary(
+            use_snapshot=False,
+            caches={"dictionary_search": LRUCache()},
+            instrumentation=instrumentation,
+        )
+        hanzi_dictionary.dictionary_search("句")
+        hanzi_dictionary.dictionary_search("句")
+
+        stats = hanzi_dictionary.stats()
+        methods = stats["methods"]
+        assert methods["HanziDictionary.compute_dictionary"]["calls"] == 1
+        assert methods["HanziDictionary.load_frequency_data"]["calls"] == 1
+        # both calls are counted, the second one is a cache hit
+        assert methods["HanziDictionary.dictionary_search"]["calls"] == 2
+        assert methods["HanziDictionary.index_search"]["calls"] == 1
+        assert stats["caches"]["dictionary_search"]["hits"] == 1
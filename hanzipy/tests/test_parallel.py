@@ -0,0 +1,67 @@
+# coding:utf-8
+import io
+
+from hanzipy import decomposition_store
+from hanzipy.decomposer import HanziDecomposer
+from hanzipy.parallel import ParallelDecomposer, iter_text_chunks
+
+import pytest
+
+TEXTS = ["是的，", "爱是", "abc 的橄", "黃是的"] * 50
+
+
+@pytest.fixture(scope="module")
+def parallel_decomposer(tmp_path_factory):
+    compiled_path = tmp_path_factory.mktemp("parallel") / "cjk_decomp.bin"
+    with ParallelDecomposer(
+        workers=2, chunk_size=5, compiled_path=compiled_path
+    ) as parallel_decomposer:
+        yield parallel_decomposer
+
+
+class TestParallelDecomposer:
+    def test_iter_text_chunks(self):
+        result = list(iter_text_chunks(["是的", "爱是", "的"], 3))
+        assert result == ["是的爱", "是的"]
+
+        result = list(iter_text_chunks(["是的爱是的"], 2))
+        assert result == ["是的", "爱是", "的"]
+        assert list(iter_text_chunks([], 3)) == []
+
+        result = list(iter_text_chunks(io.StringIO("是的爱是的"), 2))
+        assert result == ["是的", "爱是", "的"]
+
+        with pytest.raises(TypeError):
+            list(iter_text_chunks(io.BytesIO("是的".encode()), 2))
+
+    def test_decompose_many(self, parallel_decomposer):
+        expected = dict(HanziDecomposer().iter_decompose(TEXTS))
+        result = parallel_decomposer.decompose_many(TEXTS)
+
+        assert result == expected
+        assert list(result) == list(expected)
+
+    def test_iter_chunks(self, parallel_decomposer):
+        chunks = list(parallel_decomposer.iter_chunks(TEXTS[:3], 2))
+
+        assert [list(chunk) for chunk in chunks] == [["是", "的", "爱"], [], ["橄"]]
+        assert chunks[0]["爱"] == {
+            "character": "爱",
+            "components": ["爫", "冖", "𠂇", "又"],
+        }
+
+    def test_dict_store_fallback(self, tmp_path, monkeypatch):
+        # a file in place of the directory, unwritable even by root
+        (tmp_path / "readonly").write_text("")
+        compiled_path = tmp_path / "readonly" / "cjk_decomp.bin"
+        monkeypatch.setattr(
+            decomposition_store, "fallback_compiled_path", lambda path: compiled_path
+        )
+
+        with ParallelDecomposer(
+            workers=1, chunk_size=5, compiled_path=compiled_path
+        ) as parallel_decomposer:
+            assert parallel_decomposer.store == "dict"
+            assert parallel_decomposer.decompose_many(TEXTS) == dict(
+                HanziDecomposer().iter_decompose(TEXTS)
+            )
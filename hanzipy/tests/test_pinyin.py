@@ -0,0 +1,58 @@
+# coding:utf-8
+from hanzipy.pinyin import PINYIN_TABLE, PinyinSyllable, PinyinTable
+
+import pytest
+
+
+@pytest.fixture
+def pinyin_table():
+    return PinyinTable(capacity=4)
+
+
+class TestPinyinSyllable:
+    def test_parts(self):
+        pinyin_syllable = PinyinSyllable("zhuang4")
+
+        assert pinyin_syllable.syllable() == "zhuang"
+        assert pinyin_syllable.initial() == "zh"
+        assert pinyin_syllable.final() == "uang"
+        assert pinyin_syllable.tone == 4
+
+        pinyin_syllable = PinyinSyllable("yang2")
+        assert pinyin_syllable.initial() == "y"
+        assert pinyin_syllable.final() == "ang"
+
+    def test_interned(self):
+        assert PinyinSyllable.get("Yang2") is PinyinSyllable.get("yang2")
+        assert PinyinSyllable.get("Yang2").raw_syllable == "yang2"
+        assert PINYIN_TABLE.encode("YANG2") == PINYIN_TABLE.encode("yang2")
+
+
+class TestPinyinTable:
+    @pytest.mark.parametrize(
+        "charpinyin, phonetic_pinyin, regularity",
+        [
+            ("yang2", "yang2", 1),
+            ("yang2", "Yang2", 1),
+            ("yang2", "yang4", 2),
+            ("gou1", "kou3", 4),
+            ("shi4", "shan1", 3),
+            ("ju4", "bao1", 0),
+        ],
+    )
+    def test_regularity(self, pinyin_table, charpinyin, phonetic_pinyin, regularity):
+        charpinyin = pinyin_table.encode(charpinyin)
+        phonetic_pinyin = pinyin_table.encode(phonetic_pinyin)
+
+        assert pinyin_table.regularity(charpinyin, phonetic_pinyin) == regularity
+        # memoized in the matrix
+        assert pinyin_table.regularity(charpinyin, phonetic_pinyin) == regularity
+
+    def test_beyond_capacity(self, pinyin_table):
+        codes = [
+            pinyin_table.encode(pinyin)
+            for pinyin in ["a1", "b2", "c3", "d4", "gou1", "kou3"]
+        ]
+
+        assert codes[-1] >= pinyin_table.capacity
+        assert pinyin_table.regularities(codes[-2:], codes[-1:]) == [4]
@@ -0,0 +1,53 @@
+# coding:utf-8
+from hanzipy import registry
+from hanzipy.cache import LRUCache
+from hanzipy.decomposer import HanziDecomposer
+from hanzipy.dictionary import HanziDictionary
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+class TestRegistry:
+    def test_get_decomposer(self):
+        decomposer = registry.get_decomposer()
+
+        assert isinstance(decomposer, HanziDecomposer)
+        assert registry.get_decomposer() is decomposer
+        assert registry.get_decomposer(memo_size=0) is not decomposer
+
+    def test_register(self):
+        decomposer = registry.register(HanziDecomposer())
+
+        assert registry.get_decomposer() is decomposer
+
+    def test_clear(self):
+        decomposer = registry.get_decomposer()
+        registry.clear()
+
+        assert registry.get_decomposer() is not decomposer
+
+    def test_unhashable_options(self):
+        cache = LRUCache()
+        dictionary = registry.get_dictionary(caches={"get_examples": cache})
+
+        assert isinstance(dictionary, HanziDictionary)
+        assert registry.get_dictionary(caches={"get_examples": cache}) is dictionary
+        assert registry.get_dictionary(caches={"get_examples": LRUCache()}) is not (
+            dictionary
+        )
+
+    def test_option_key(self):
+        assert registry.option_key({"b": [1], "a": {2}}) == registry.option_key(
+            {"a": {2}, "b": [1]}
+        )
+        assert registry.option_key([1]) != registry.option_key((1,))
+
+        value = bytearray()
+        assert registry.option_key(value) == (id, id(value))
@@ -0,0 +1,80 @@
+# coding:utf-8
+import io
+from types import SimpleNamespace
+
+from hanzipy.segmenter import HanziSegmenter
+from hanzipy.trie import WordTrie
+
+import pytest
+
+
+@pytest.fixture
+def segmenter():
+    word_freq = {
+        "我們": 500,
+        "都": 800,
+        "是": 2000,
+        "陌生": 50,
+        "陌生人": 40,
+        "生人": 5,
+        "人": 900,
+        "研究": 300,
+        "研究生": 80,
+        "生命": 120,
+        "起源": 60,
+        "的": 5000,
+    }
+    dictionary = SimpleNamespace(
+        word_trie=WordTrie(list(word_freq) + ["卡拉OK", "命"]),
+        word_freq=word_freq,
+    )
+    return HanziSegmenter(dictionary)
+
+
+class TestSegmenter:
+    def test_segment(self, segmenter):
+        assert segmenter.segment("我們都是陌生人。") == [
+            "我們",
+            "都",
+            "是",
+            "陌生人",
+            "。",
+        ]
+        assert segmenter.segment("研究生命的起源") == [
+            "研究",
+            "生命",
+            "的",
+            "起源",
+        ]
+
+    def test_segment_unknown(self, segmenter):
+        assert segmenter.segment("我們是ABC 123人!") == [
+            "我們",
+            "是",
+            "ABC",
+            " ",
+            "123",
+            "人",
+            "!",
+        ]
+        assert segmenter.segment("卡拉OK") == ["卡拉OK"]
+        assert segmenter.segment("") == []
+
+    def test_iter_segment(self, segmenter):
+        text = "我們都是陌生人。研究生命的起源，" * 20
+        words = segmenter.segment(text)
+
+        assert "".join(words) == text
+        # the stream is cut in the middle of words
+        assert list(segmenter.iter_segment(io.StringIO(text), chunk_size=7)) == words
+        assert list(segmenter.iter_segment([text[:3], text[3:10], text[10:]])) == words
+
+    def test_iter_segment_binary_file(self, segmenter):
+        with pytest.raises(TypeError):
+            list(segmenter.iter_segment(io.BytesIO("我們都是".encode())))
+
+    def test_segment_many(self, segmenter):
+        assert segmenter.segment_many(["我們都是", "人"]) == [
+            ["我們", "都", "是"],
+            ["人"],
+        ]
@@ -0,0 +1,44 @@
+# coding:utf-8
+from hanzipy import snapshot
+from hanzipy.snapshot import load_snapshot, write_snapshot
+
+import pytest
+
+
+@pytest.fixture
+def source(tmp_path):
+    source_path = tmp_path / "source.txt"
+    source_path.write_text("一\n二\n", encoding="utf-8")
+    return source_path
+
+
+class TestSnapshot:
+    def test_round_trip(self, source, tmp_path):
+        snapshot_path = tmp_path / "test.snapshot"
+        payload = {"words": ["一", "二"], "shared": {"a": [1]}}
+
+        assert write_snapshot(snapshot_path, payload, [source]) is True
+        assert load_snapshot(snapshot_path, [source]) == payload
+
+    def test_missing(self, source, tmp_path):
+        assert load_snapshot(tmp_path / "missing.snapshot", [source]) is None
+
+    def test_stale_source(self, source, tmp_path):
+        snapshot_path = tmp_path / "test.snapshot"
+        write_snapshot(snapshot_path, {"words": []}, [source])
+
+        source.write_text("三\n", encoding="utf-8")
+        assert load_snapshot(snapshot_path, [source]) is None
+
+    def test_version_mismatch(self, source, tmp_path, monkeypatch):
+        snapshot_path = tmp_path / "test.snapshot"
+        write_snapshot(snapshot_path, {"words": []}, [source])
+
+        monkeypatch.setattr(snapshot, "SNAPSHOT_VERSION", snapshot.SNAPSHOT_VERSION + 1)
+        assert load_snapshot(snapshot_path, [source]) is None
+
+    def test_corrupted(self, source, tmp_path):
+        snapshot_path = tmp_path / "test.snapshot"
+        snapshot_path.write_bytes(b"not a snapshot")
+
+        assert load_snapshot(snapshot_path, [source]) is None
@@ -0,0 +1,46 @@
+# coding:utf-8
+import pickle
+
+from hanzipy.trie import WordTrie
+
+import pytest
+
+
+@pytest.fixture
+def word_trie():
+    return WordTrie(["中", "中国", "中国人", "中文", "人", "国人", "中国"])
+
+
+class TestWordTrie:
+    def test_prefix_search(self, word_trie):
+        assert word_trie.prefix_search("中") == ["中", "中国", "中国人", "中文"]
+        assert word_trie.prefix_search("中国") == ["中国", "中国人"]
+        assert word_trie.prefix_search("中", limit=2) == ["中", "中国"]
+        assert word_trie.prefix_search("") == list(word_trie)
+        assert word_trie.prefix_search("日") == []
+
+    def test_longest_prefix(self, word_trie):
+        assert word_trie.longest_prefix("中国人民") == "中国人"
+        assert word_trie.longest_prefix("中国话") == "中国"
+        assert word_trie.longest_prefix("我是中国人", 2) == "中国人"
+        assert word_trie.longest_prefix("我是中国人") is None
+        assert word_trie.longest_prefix("") is None
+
+    def test_iter_prefixes_of(self, word_trie):
+        assert list(word_trie.iter_prefixes_of("中国人民")) == ["中", "中国", "中国人"]
+        assert list(word_trie.iter_prefixes_of("中国人民", 1)) == ["国人"]
+        assert list(word_trie.iter_prefixes_of("中国人民", 4)) == []
+
+    def test_contains(self, word_trie):
+        assert "中国" in word_trie
+        assert "中国人" in word_trie
+        # a prefix, not a word
+        assert "国" not in word_trie
+        assert "日本" not in word_trie
+        assert len(word_trie) == 6
+
+    def test_pickle(self, word_trie):
+        unpickled = pickle.loads(pickle.dumps(word_trie))
+
+        assert list(unpickled) == list(word_trie)
+        assert unpickled.longest_prefix("中国人民") == "中国人"
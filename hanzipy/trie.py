@@ -0,0 +1,112 @@
+# coding:utf-8
+from array import array
+
+# Edges are keyed by (node << CHARACTER_BITS) | ord(character),
+# enough for every unicode code point.
+CHARACTER_BITS = 21
+
+
+class WordTrie:
+    """
+    Prefix tree over a set of words, stored flat so that it pickles quickly.
+
+    Nodes are integers, node 0 being the root. Every edge is a single entry
+    of one int -> int dict, so walking a text costs one dict lookup
+    per character. Words are kept sorted, and each node stores the range
+    of the words that start with its prefix.
+    """
+
+    def __init__(self, words=()):
+        self.words = sorted(set(words))
+        self.edges = {}
+        # words[word_starts[node]:word_ends[node]] start with the node prefix
+        self.word_starts = array("I", [0])
+        self.word_ends = array("I", [len(self.words)])
+        # 1 for the nodes where a word ends
+        self.terminals = bytearray(1)
+
+        for word_id, word in enumerate(self.words):
+            node = 0
+
+            for character in word:
+                edge = (node << CHARACTER_BITS) | ord(character)
+                child = self.edges.get(edge)
+
+                if child is None:
+                    child = self.edges[edge] = len(self.terminals)
+                    self.word_starts.append(word_id)
+                    self.word_ends.append(word_id + 1)
+                    self.terminals.append(0)
+                else:
+                    self.word_ends[child] = word_id + 1
+
+                node = child
+
+            self.terminals[node] = 1
+
+    def find_node(self, prefix):
+        node = 0
+
+        for character in prefix:
+            node = self.edges.get((node << CHARACTER_BITS) | ord(character))
+            if node is None:
+                return
+
+        return node
+
+    def prefix_search(self, prefix, limit=None):
+        """Words starting with prefix, in sorted order."""
+        node = self.find_node(prefix)
+        if node is None:
+            return []
+
+        start = self.word_starts[node]
+        end = self.word_ends[node]
+        if limit is not None:
+            end = min(end, start + limit)
+
+        return self.words[start:end]
+
+    def iter_prefixes_of(self, text, start=0):
+        """Yields the words that text[start:] starts with, shortest first."""
+        edges = self.edges
+        terminals = self.terminals
+        node = 0
+
+        for end in range(start, len(text)):
+            node = edges.get((node << CHARACTER_BITS) | ord(text[end]))
+            if node is None:
+                return
+
+            if terminals[node]:
+                yield text[start : end + 1]
+
+    def longest_prefix(self, text, start=0):
+        """Longest word that text[start:] starts with, None if there is none."""
+        edges = self.edges
+        terminals = self.terminals
+        node = 0
+        longest_end = None
+
+        for end in range(start, len(text)):
+            node = edges.get((node << CHARACTER_BITS) | ord(text[end]))
+            if node is None:
+                break
+
+            if terminals[node]:
+                longest_end = end + 1
+
+        if longest_end is None:
+            return
+
+        return text[start:longest_end]
+
+    def __contains__(self, word):
+        node = self.find_node(word)
+        return node is not None and bool(self.terminals[node])
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __len__(self):
+        return len(self.words)
@@ -4,3 +4,23 @@ __version_info__ = (1, 0, 4)
 
 def get_version():
     return __version__
+
+
+def iter_file_chunks(text_file, chunk_size):
+    """
+    Reads text_file, a file-like object opened in text mode,
+    chunk_size characters at a time until its end.
+    """
+    while True:
+        chunk = text_file.read(chunk_size)
+        if not chunk:
+            return
+
+        if not isinstance(chunk, str):
+            raise TypeError(
+                "expected a file opened in text mode, got {} chunks".format(
+                    type(chunk).__name__
+                )
+            )
+
+        yield chunk